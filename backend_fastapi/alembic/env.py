@@ -21,8 +21,11 @@ from app.models.comment import Comment
 from app.models.follow import Follow
 from app.models.like import Like
 from app.models.notification import Notification
-from app.models.reel import Reel
-from app.models.story import Story
+from app.models.reel import Reel, ReelView
+from app.models.story import Story, StoryView
+from app.models.hashtag import Hashtag, HashtagLink, Mention
+from app.models.recommendation import UserRecommendation
+from app.models.media import MediaTombstone
 
 # This will load the alembic.ini configuration
 config = context.config
@@ -0,0 +1,75 @@
+"""add engagement indexes
+
+Unique and covering indexes for the follow, like and comment hot paths.
+Indexes are built with CREATE INDEX CONCURRENTLY so the tables stay
+writable; duplicate follows/likes left by earlier races are removed
+first so the unique indexes can be built.
+
+Revision ID: 3f6c2a9d8e41
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c2a9d8e41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("uq_follows_follower_following_idx", "follows", "(follower_id, following_id)", True, None),
+    ("ix_follows_following_follower", "follows", "(following_id, follower_id)", False, None),
+    ("uq_likes_post_user", "likes", "(post_id, user_id)", True, "post_id IS NOT NULL"),
+    ("uq_likes_reel_user", "likes", "(reel_id, user_id)", True, "reel_id IS NOT NULL"),
+    ("ix_comments_post_parent_created", "comments", "(post_id, parent_id, created_at)", False, None),
+    ("ix_comments_reel_parent_created", "comments", "(reel_id, parent_id, created_at)", False, None),
+    ("ix_comments_parent_created", "comments", "(parent_id, created_at)", False, None),
+]
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM follows a USING follows b
+        WHERE a.follower_id = b.follower_id AND a.following_id = b.following_id AND a.id > b.id
+    """)
+    op.execute("""
+        DELETE FROM likes a USING likes b
+        WHERE a.post_id = b.post_id AND a.user_id = b.user_id AND a.id > b.id
+    """)
+    op.execute("""
+        DELETE FROM likes a USING likes b
+        WHERE a.reel_id = b.reel_id AND a.user_id = b.user_id AND a.id > b.id
+    """)
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in INDEXES:
+            op.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} {columns}{f' WHERE {where}' if where else ''}"
+            )
+
+    # Promote the unique index to the constraint declared on the Follow model
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_follows_follower_following') THEN
+                ALTER TABLE follows ADD CONSTRAINT uq_follows_follower_following
+                    UNIQUE USING INDEX uq_follows_follower_following_idx;
+            ELSE
+                DROP INDEX IF EXISTS uq_follows_follower_following_idx;
+            END IF;
+        END $$
+    """)
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_follows_follower_following", "follows", type_="unique")
+    with op.get_context().autocommit_block():
+        for name, _, _, _, _ in reversed(INDEXES[1:]):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,31 @@
+"""add story owner/expires index
+
+Composite index for active-story lookups by author (story tray, profile).
+
+Revision ID: 5e2b8f1c6a47
+Revises: c41e9a7b5d23
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b8f1c6a47'
+down_revision = 'c41e9a7b5d23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stories_owner_expires "
+            "ON stories (owner_id, expires_at)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_stories_owner_expires")
@@ -0,0 +1,40 @@
+"""add comment reply_count
+
+Denormalized reply counter on comments, backfilled from existing replies.
+
+Revision ID: 8b1d4e7c2a90
+Revises: 3f6c2a9d8e41
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1d4e7c2a90'
+down_revision = '3f6c2a9d8e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "comments",
+        sa.Column("reply_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.execute("""
+        UPDATE comments AS c
+        SET reply_count = r.n
+        FROM (
+            SELECT parent_id, count(*) AS n
+            FROM comments
+            WHERE parent_id IS NOT NULL
+            GROUP BY parent_id
+        ) AS r
+        WHERE c.id = r.parent_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("comments", "reply_count")
@@ -0,0 +1,39 @@
+"""add updated_at markers
+
+Row version markers for posts, reels and users, used to build ETags.
+
+Revision ID: 9a7d3e5b1f08
+Revises: 5e2b8f1c6a47
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a7d3e5b1f08'
+down_revision = '5e2b8f1c6a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True)
+    )
+    op.add_column(
+        "reels",
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=True)
+    )
+    op.add_column(
+        "users",
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "updated_at")
+    op.drop_column("reels", "updated_at")
+    op.drop_column("posts", "updated_at")
@@ -0,0 +1,35 @@
+"""create story_views
+
+One row per (story, viewer), for the seen state of the story tray.
+
+Revision ID: a6c9e1f4d725
+Revises: f3b8d2e6a514
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c9e1f4d725'
+down_revision = 'f3b8d2e6a514'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "story_views",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("story_id", sa.Integer(), sa.ForeignKey("stories.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("viewer_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("viewed_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.UniqueConstraint("story_id", "viewer_id", name="uq_story_views_story_viewer"),
+    )
+    op.create_index("ix_story_views_id", "story_views", ["id"])
+    op.create_index("ix_story_views_viewer_story", "story_views", ["viewer_id", "story_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("story_views")
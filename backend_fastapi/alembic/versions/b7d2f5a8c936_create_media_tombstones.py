@@ -0,0 +1,33 @@
+"""create media_tombstones
+
+Media files whose owning row was deleted, removed later by the media sweeper.
+
+Revision ID: b7d2f5a8c936
+Revises: a6c9e1f4d725
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f5a8c936'
+down_revision = 'a6c9e1f4d725'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("media_url", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_media_tombstones_id", "media_tombstones", ["id"])
+    op.create_index("ix_media_tombstones_created_at", "media_tombstones", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("media_tombstones")
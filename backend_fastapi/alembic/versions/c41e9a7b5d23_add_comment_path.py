@@ -0,0 +1,48 @@
+"""add comment path
+
+Materialized path for comment threads, backfilled from parent_id.
+
+Revision ID: c41e9a7b5d23
+Revises: 8b1d4e7c2a90
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41e9a7b5d23'
+down_revision = '8b1d4e7c2a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("comments", sa.Column("path", sa.Text(), nullable=True))
+    op.execute("""
+        WITH RECURSIVE tree AS (
+            SELECT id, lpad(id::text, 10, '0') || '/' AS path
+            FROM comments
+            WHERE parent_id IS NULL
+            UNION ALL
+            SELECT c.id, tree.path || lpad(c.id::text, 10, '0') || '/'
+            FROM comments AS c
+            JOIN tree ON c.parent_id = tree.id
+        )
+        UPDATE comments AS c
+        SET path = tree.path
+        FROM tree
+        WHERE c.id = tree.id
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_comments_path "
+            "ON comments (path text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_comments_path")
+    op.drop_column("comments", "path")
@@ -0,0 +1,35 @@
+"""create reel_views
+
+One row per (reel, viewer); seen reels are left out of the ranked feed.
+
+Revision ID: c8e3a6b9d047
+Revises: b7d2f5a8c936
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e3a6b9d047'
+down_revision = 'b7d2f5a8c936'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reel_views",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("reel_id", sa.Integer(), sa.ForeignKey("reels.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("viewer_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("viewed_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.UniqueConstraint("viewer_id", "reel_id", name="uq_reel_views_viewer_reel"),
+    )
+    op.create_index("ix_reel_views_id", "reel_views", ["id"])
+    op.create_index("ix_reel_views_reel_id", "reel_views", ["reel_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("reel_views")
@@ -0,0 +1,32 @@
+"""add post owner/created index
+
+Composite index for the profile grid: a user's posts newest first, with
+the id as keyset tie-breaker.
+
+Revision ID: d27f4b8c1e63
+Revises: 9a7d3e5b1f08
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd27f4b8c1e63'
+down_revision = '9a7d3e5b1f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_owner_created "
+            "ON posts (owner_id, created_at, id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_posts_owner_created")
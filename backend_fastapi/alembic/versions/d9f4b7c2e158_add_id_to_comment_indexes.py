@@ -0,0 +1,47 @@
+"""add id to comment indexes
+
+Comment pages are ordered and keyset-paginated by (created_at, id); with id
+in the thread and reply indexes the whole order comes from the index, so
+ties on created_at need no sort. Each index is rebuilt under a temporary
+name and swapped in, with CREATE INDEX CONCURRENTLY so the table stays
+writable.
+
+Revision ID: d9f4b7c2e158
+Revises: c8e3a6b9d047
+Create Date: 2026-10-19 16:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f4b7c2e158'
+down_revision = 'c8e3a6b9d047'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_comments_post_parent_created", "(post_id, parent_id, created_at{})"),
+    ("ix_comments_reel_parent_created", "(reel_id, parent_id, created_at{})"),
+    ("ix_comments_parent_created", "(parent_id, created_at{})"),
+]
+
+
+def _rebuild(tie_breaker: str) -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}_new")
+            op.execute(f"CREATE INDEX CONCURRENTLY {name}_new ON comments {columns.format(tie_breaker)}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    _rebuild(", id")
+
+
+def downgrade() -> None:
+    _rebuild("")
@@ -0,0 +1,65 @@
+"""create hashtag tables
+
+Hashtag inverted index (hashtags, hashtag_links) and mentions, filled by
+index_caption on every post and reel create or edit.
+
+Revision ID: e1a4c7d9b203
+Revises: d27f4b8c1e63
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a4c7d9b203'
+down_revision = 'd27f4b8c1e63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "hashtags",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_hashtags_id", "hashtags", ["id"])
+    op.create_index("ix_hashtags_name", "hashtags", ["name"], unique=True)
+
+    op.create_table(
+        "hashtag_links",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("hashtag_id", sa.Integer(), sa.ForeignKey("hashtags.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("reel_id", sa.Integer(), sa.ForeignKey("reels.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_hashtag_links_id", "hashtag_links", ["id"])
+    op.create_index("ix_hashtag_links_post_id", "hashtag_links", ["post_id"])
+    op.create_index("ix_hashtag_links_reel_id", "hashtag_links", ["reel_id"])
+    op.create_index("ix_hashtag_links_hashtag_post", "hashtag_links", ["hashtag_id", "post_id"])
+    op.create_index("ix_hashtag_links_hashtag_reel", "hashtag_links", ["hashtag_id", "reel_id"])
+    op.create_index("ix_hashtag_links_created_at", "hashtag_links", ["created_at"])
+
+    op.create_table(
+        "mentions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("sender_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("reel_id", sa.Integer(), sa.ForeignKey("reels.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_mentions_id", "mentions", ["id"])
+    op.create_index("ix_mentions_post_id", "mentions", ["post_id"])
+    op.create_index("ix_mentions_reel_id", "mentions", ["reel_id"])
+    op.create_index("ix_mentions_user_created", "mentions", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("mentions")
+    op.drop_table("hashtag_links")
+    op.drop_table("hashtags")
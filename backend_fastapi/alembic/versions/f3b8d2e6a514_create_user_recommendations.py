@@ -0,0 +1,36 @@
+"""create user_recommendations
+
+Precomputed "people you may know" candidates per user.
+
+Revision ID: f3b8d2e6a514
+Revises: e1a4c7d9b203
+Create Date: 2026-10-19 16:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2e6a514'
+down_revision = 'e1a4c7d9b203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_recommendations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("candidate_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("computed_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_user_recommendations_id", "user_recommendations", ["id"])
+    op.create_index("ix_user_recommendations_computed_at", "user_recommendations", ["computed_at"])
+    op.create_index("ix_user_recommendations_user_score", "user_recommendations", ["user_id", "score"])
+
+
+def downgrade() -> None:
+    op.drop_table("user_recommendations")
@@ -4,17 +4,26 @@ from sqlalchemy.future import select
 from app.models.user import User
 from app.schemas.user import UserOut, UserUpdate
 from app.services.auth import get_current_active_user
-from app.database import get_async_session
+from app.database import get_async_session, get_read_session, get_pool_metrics
 from app.models.post import Post
-from app.schemas.post import PostOut, PostUpdate
-from app.services.post import get_post_by_id_service, update_post, delete_post
-from app.schemas.reel import ReelOut, ReelUpdate  # adjust import paths as needed
+from app.schemas.post import PostOut, PostUpdate, PostListItem
+from app.services.post import get_post_by_id_service, get_post_version, update_post, delete_post
+from app.schemas.reel import ReelOut, ReelUpdate, ReelListItem  # adjust import paths as needed
 from app.models.reel import Reel
-from app.services.reel import get_reel_by_id_service, update_reel
-from app.schemas.story import StoryOut
+from app.services.reel import get_reel_by_id_service, get_reel_version, update_reel
+from app.schemas.story import StoryOut, StoryListItem
 from app.models.story import Story
 from app.services.story import get_story_by_id_service, delete_story
 from sqlalchemy.orm import selectinload
+from app.utils.entity_cache import user_cache
+from app.utils.singleflight import coalescing_metrics
+from app.services.projection import (
+    USER_OUT_COLUMNS,
+    select_post_items, post_items,
+    select_reel_items, reel_item,
+    select_story_items, story_item
+)
+from app.utils.fast_json import FastJSONResponse
 
 router = APIRouter(prefix="/admin", tags=["Admin User Management"])
 
@@ -23,14 +32,29 @@ def admin_required(current_user: User = Depends(get_current_active_user)):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
 
+@router.get("/metrics/coalescing", response_class=FastJSONResponse)
+async def get_coalescing_metrics(_: User = Depends(admin_required)):
+    return coalescing_metrics()
+
+@router.get("/metrics/db-pool", response_class=FastJSONResponse)
+async def get_db_pool_metrics(_: User = Depends(admin_required)):
+    return get_pool_metrics()
+
 @router.get("/users", response_model=list[UserOut])
-async def list_users(skip: int = 0, limit: int = 20, db: AsyncSession = Depends(get_async_session), _: User = Depends(admin_required)):
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    return result.scalars().all()
+async def list_users(skip: int = 0, limit: int = 20, db: AsyncSession = Depends(get_read_session), _: User = Depends(admin_required)):
+    result = await db.execute(select(*USER_OUT_COLUMNS).offset(skip).limit(limit))
+    return result.all()
 
 @router.get("/users/{user_id}", response_model=UserOut)
 async def get_user(user_id: int, db: AsyncSession = Depends(get_async_session), _: User = Depends(admin_required)):
-    user = await db.get(User, user_id)
+    async def load():
+        user = await db.get(User, user_id)
+        return UserOut.model_validate(user).model_dump(mode="json") if user else None
+
+    version = await db.scalar(select(User.updated_at).where(User.id == user_id))
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = await user_cache.get_or_load(f"id:{user_id}", load, (version,))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -40,9 +64,11 @@ async def update_user(user_id: int, user_update: UserUpdate, db: AsyncSession =
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    old_username = user.username
     for field, value in user_update.dict(exclude_unset=True).items():
         setattr(user, field, value)
     await db.commit()
+    await user_cache.invalidate(f"id:{user_id}", f"username:{old_username}", f"username:{user.username}")
     await db.refresh(user)
     return user
 
@@ -51,31 +77,30 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_session
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    username = user.username
     await db.delete(user)
     await db.commit()
+    await user_cache.invalidate(f"id:{user_id}", f"username:{username}")
     return {"detail": "User deleted"}
 
 
 
-@router.get("/posts", response_model=list[PostOut])
+@router.get("/posts", response_model=list[PostListItem])
 async def admin_list_posts(
     skip: int = 0,
     limit: int = 20,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(admin_required)
 ):
-    result = await db.execute(
-        select(Post)
-        .options(selectinload(Post.owner))
-        .offset(skip)
-        .limit(limit)
-    )
-    posts = result.scalars().unique().all()
-    return [PostOut.model_validate(post, from_attributes=True) for post in posts]
+    result = await db.execute(select_post_items().offset(skip).limit(limit))
+    return post_items(result.all())
 
 @router.get("/posts/{post_id}", response_model=PostOut)
 async def admin_get_post(post_id: int, db: AsyncSession = Depends(get_async_session), _: User = Depends(admin_required)):
-    post = await get_post_by_id_service(post_id, db)
+    version = await get_post_version(post_id, db)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    post = await get_post_by_id_service(post_id, db, version)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
@@ -92,25 +117,22 @@ async def admin_delete_post(post_id: int, db: AsyncSession = Depends(get_async_s
 
 # --- Admin Reel Management (example, adjust as needed) ---
 
-@router.get("/reels", response_model=list[ReelOut])
+@router.get("/reels", response_model=list[ReelListItem])
 async def admin_list_reels(
     skip: int = 0,
     limit: int = 20,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     _: User = Depends(admin_required)
 ):
-    result = await db.execute(
-        select(Reel)
-        .options(selectinload(Reel.owner))
-        .offset(skip)
-        .limit(limit)
-    )
-    reels = result.scalars().unique().all()
-    return [ReelOut.model_validate(reel, from_attributes=True) for reel in reels]
+    result = await db.execute(select_reel_items().offset(skip).limit(limit))
+    return [reel_item(row) for row in result.all()]
 
 @router.get("/reels/{reel_id}", response_model=ReelOut)
 async def admin_get_reel(reel_id: int, db: AsyncSession = Depends(get_async_session), _: User = Depends(admin_required)):
-    reel = await get_reel_by_id_service(reel_id, db)
+    version = await get_reel_version(reel_id, db)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Reel not found")
+    reel = await get_reel_by_id_service(reel_id, db, version)
     if not reel:
         raise HTTPException(status_code=404, detail="Reel not found")
     return reel
@@ -135,16 +157,10 @@ async def admin_delete_reel(reel_id: int, db: AsyncSession = Depends(get_async_s
 
 # --- Admin Story Management (example, adjust as needed) ---
 
-@router.get("/stories", response_model=list[StoryOut])
-async def admin_list_stories(skip: int = 0, limit: int = 20, db: AsyncSession = Depends(get_async_session), _: User = Depends(admin_required)):
-    result = await db.execute(
-        select(Story)
-        .options(selectinload(Story.owner))
-        .offset(skip)
-        .limit(limit)
-    )
-    stories = result.scalars().unique().all()
-    return [StoryOut.model_validate(story, from_attributes=True) for story in stories]
+@router.get("/stories", response_model=list[StoryListItem])
+async def admin_list_stories(skip: int = 0, limit: int = 20, db: AsyncSession = Depends(get_read_session), _: User = Depends(admin_required)):
+    result = await db.execute(select_story_items().offset(skip).limit(limit))
+    return [story_item(row) for row in result.all()]
 
 @router.get("/stories/{story_id}", response_model=StoryOut)
 async def admin_get_story(story_id: int, db: AsyncSession = Depends(get_async_session), _: User = Depends(admin_required)):
@@ -1,11 +1,11 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.comment import Comment
-from app.schemas.comment import CommentCreate, CommentOut, CommentBrief
+from app.schemas.comment import CommentCreate, CommentOut, CommentBrief, CommentNode
 from app.services.like import like_post, unlike_post
 from app.services.comment import (
     create_comment,
@@ -16,15 +16,22 @@ from app.services.comment import (
     reply_to_reel_comment,
     get_comments_for_reel,
     get_reel_comment_replies,
-    delete_reel_comment
+    delete_reel_comment,
+    get_comment_subtree
 )
 from app.services.auth import get_current_active_user
 from app.models.user import User
 from app.database import get_async_session
+from app.utils.http_cache import cache_control, NO_CACHE
 from app.services.like import like_reel, unlike_reel
 
 router = APIRouter(prefix="/engagement", tags=["Engagement"])
 
+# Upper bounds for client-chosen page sizes
+MAX_COMMENTS_PAGE = 50
+MAX_REPLIES_PREVIEW = 10
+MAX_THREAD_SIZE = 500
+
 @router.post("/posts/{post_id}/like")
 async def like_a_post(
     post_id: int,
@@ -64,13 +71,12 @@ async def create_new_comment(
         current_user: User = Depends(get_current_active_user),
         db: AsyncSession = Depends(get_async_session)
 ):
-    comment = await create_comment(
+    return await create_comment(
         post_id=post_id,
         user_id=current_user.id,
         content=comment_data.content,
         db=db
     )
-    return CommentBrief.model_validate(comment, from_attributes=True)
 
 
 @router.post("/comments/{comment_id}/reply", response_model=CommentBrief)
@@ -86,44 +92,49 @@ async def reply_to_comment(
     if not parent_comment:
         raise HTTPException(status_code=404, detail="Parent comment not found")
 
-    comment = await create_comment(
+    return await create_comment(
         post_id=parent_comment.post_id,
         user_id=current_user.id,
         content=comment_data.content,
         parent_id=comment_id,
         db=db
     )
-    return CommentBrief.model_validate(comment, from_attributes=True)
 
 
 
-@router.get("/posts/{post_id}/comments", response_model=List[CommentOut])
+@router.get("/posts/{post_id}/comments", response_model=List[CommentOut], dependencies=[Depends(cache_control(NO_CACHE))])
 async def get_post_comments(
     post_id: int,
-    skip: int = 0,
-    limit: int = 10,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_COMMENTS_PAGE),
+    before_id: Optional[int] = None,
+    replies_limit: int = Query(3, ge=0, le=MAX_REPLIES_PREVIEW),
     db: AsyncSession = Depends(get_async_session)
 ):
     # Directly return the CommentOut list
-    return await get_comments_for_post(post_id, skip, limit, db)
+    return await get_comments_for_post(post_id, skip, limit, db, before_id=before_id, replies_limit=replies_limit)
 
 
 
 @router.get("/comments/{comment_id}/replies", response_model=Dict)
 async def get_comment_replies_list(
         comment_id: int,
-        skip: int = 0,
-        limit: int = 5,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(5, ge=1, le=MAX_COMMENTS_PAGE),
+        after_id: Optional[int] = None,
         db: AsyncSession = Depends(get_async_session)
 ):
-    result = await get_comment_replies(comment_id, skip, limit, db)
+    return await get_comment_replies(comment_id, skip, limit, db, after_id=after_id)
+
 
-    return {
-        "replies": [CommentBrief.model_validate(r, from_attributes=True) for r in result["replies"]],
-        "total": result["total"],
-        "skip": result["skip"],
-        "limit": result["limit"]
-    }
+@router.get("/comments/{comment_id}/thread", response_model=List[CommentNode])
+async def get_comment_thread(
+        comment_id: int,
+        limit: int = Query(200, ge=1, le=MAX_THREAD_SIZE),
+        db: AsyncSession = Depends(get_async_session)
+):
+    """A comment with its full reply tree, depth-first"""
+    return await get_comment_subtree(comment_id, limit, db)
 
 
 @router.delete("/comments/{comment_id}")
@@ -144,13 +155,12 @@ async def create_new_reel_comment(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session)
 ):
-    comment = await create_reel_comment(
+    return await create_reel_comment(
         reel_id=reel_id,
         user_id=current_user.id,
         content=comment_data.content,
         db=db
     )
-    return CommentBrief.model_validate(comment, from_attributes=True)
 
 @router.post("/reels/{reel_id}/comments/{comment_id}/reply", response_model=CommentBrief)
 async def reply_to_reel_comment_endpoint(
@@ -160,63 +170,34 @@ async def reply_to_reel_comment_endpoint(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session)
 ):
-    comment = await reply_to_reel_comment(
+    return await reply_to_reel_comment(
         reel_id=reel_id,
         parent_id=comment_id,
         user_id=current_user.id,
         content=comment_data.content,
         db=db
     )
-    return CommentBrief.model_validate(comment, from_attributes=True)
 
-@router.get("/reels/{reel_id}/comments", response_model=List[CommentOut])
+@router.get("/reels/{reel_id}/comments", response_model=List[CommentOut], dependencies=[Depends(cache_control(NO_CACHE))])
 async def get_reel_comments(
     reel_id: int,
-    skip: int = 0,
-    limit: int = 10,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_COMMENTS_PAGE),
+    before_id: Optional[int] = None,
+    replies_limit: int = Query(3, ge=0, le=MAX_REPLIES_PREVIEW),
     db: AsyncSession = Depends(get_async_session)
 ):
-    result = await get_comments_for_reel(reel_id, skip, limit, db)
-    comments = result["comments"]
-    replies_by_parent = result["replies_by_parent"]
-    response = []
-    for comment in comments:
-        comment_out = CommentOut(
-            id=comment.id,
-            content=comment.content,
-            user_id=comment.user_id,
-            reel_id=comment.reel_id,
-            parent_id=comment.parent_id,
-            created_at=comment.created_at,
-            replies=[
-                CommentBrief(
-                    id=reply.id,
-                    content=reply.content,
-                    user_id=reply.user_id,
-                    reel_id=reply.reel_id,
-                    parent_id=reply.parent_id,
-                    created_at=reply.created_at,
-                )
-                for reply in replies_by_parent.get(comment.id, [])
-            ]
-        )
-        response.append(comment_out)
-    return response
+    return await get_comments_for_reel(reel_id, skip, limit, db, before_id=before_id, replies_limit=replies_limit)
 
 @router.get("/reels/comments/{comment_id}/replies", response_model=Dict)
 async def get_reel_comment_replies_list(
     comment_id: int,
-    skip: int = 0,
-    limit: int = 5,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(5, ge=1, le=MAX_COMMENTS_PAGE),
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_async_session)
 ):
-    result = await get_reel_comment_replies(comment_id, skip, limit, db)
-    return {
-        "replies": [CommentBrief.model_validate(r, from_attributes=True) for r in result["replies"]],
-        "total": result["total"],
-        "skip": result["skip"],
-        "limit": result["limit"]
-    }
+    return await get_reel_comment_replies(comment_id, skip, limit, db, after_id=after_id)
 
 @router.delete("/reels/comments/{comment_id}")
 async def delete_a_reel_comment(
@@ -9,7 +9,7 @@ from app.services.follow import (
 from app.services.auth import get_current_active_user
 from app.models.user import User
 from app.schemas.user import UserOut
-from app.database import get_async_session
+from app.database import get_async_session, get_read_session
 from sqlalchemy import select, func
 from app.models.follow import Follow
 
@@ -37,7 +37,7 @@ async def get_user_followers(
     skip: int = 0,
     limit: int = 10,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await get_followers(user_id, skip, limit, db, current_user_id=current_user.id)
 
@@ -47,6 +47,6 @@ async def get_user_following(
     skip: int = 0,
     limit: int = 10,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await get_following(user_id, skip, limit, db, current_user_id=current_user.id)
\ No newline at end of file
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+from typing import List
+from fastapi import APIRouter, Depends, UploadFile, File, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.story import (
     create_story,
     get_user_stories,
     get_following_stories,
+    get_story_tray,
+    mark_story_viewed,
     delete_story
 )
 from app.services.reel import (
@@ -13,12 +16,16 @@ from app.services.reel import (
 )
 from app.services.auth import get_current_active_user
 from app.models.user import User
-from app.database import get_async_session
+from app.database import get_async_session, get_read_session
 from app.services.reel import delete_reel
 from fastapi import Form
-from app.schemas.reel import ReelUpdate
+from app.schemas.reel import ReelUpdate, ReelOut
 from app.services.reel import update_reel
 from app.services.reel import get_all_reels
+from app.services.reel_feed import get_reel_feed, mark_reel_viewed
+from app.services.reel import get_user_reels_version
+from app.utils.http_cache import cache_control, not_modified, weak_etag, PRIVATE_REVALIDATE
+from app.schemas.story import StoryItem, StoryTrayItem
 
 router = APIRouter(prefix="/media", tags=["Media"])
 
@@ -30,14 +37,14 @@ async def upload_story(
 ):
     return await create_story(current_user.id, media, db)
 
-@router.get("/stories/me")
+@router.get("/stories/me", response_model=List[StoryItem])
 async def get_my_stories(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session)
 ):
     return await get_user_stories(current_user.id, db)
 
-@router.get("/stories/following")
+@router.get("/stories/following", response_model=List[StoryItem])
 async def get_stories_from_following(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session)
@@ -45,6 +52,30 @@ async def get_stories_from_following(
     return await get_following_stories(current_user.id, db)
 
 
+@router.get("/stories/tray", response_model=List[StoryTrayItem])
+async def get_stories_tray(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    return await get_story_tray(current_user.id, db)
+
+@router.get("/stories/users/{user_id}", response_model=List[StoryItem])
+async def get_stories_of_user(
+    user_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    return await get_user_stories(user_id, db)
+
+@router.post("/stories/{story_id}/view")
+async def view_story(
+    story_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    return await mark_story_viewed(story_id, current_user.id, db)
+
+
 @router.delete("/stories/{story_id}")
 async def remove_story(
     story_id: int,
@@ -66,31 +97,59 @@ async def upload_reel(
     return await create_reel(current_user.id, video, caption, db)
 
 
-@router.get("/reels/following")
+@router.get("/reels/following", response_model=List[ReelOut])
 async def get_reels_from_following(
     skip: int = 0,
     limit: int = 10,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await get_following_reels(current_user.id, skip, limit, db)
 
-@router.get("/reels/{user_id}")
+@router.get("/reels/feed", response_model=List[ReelOut])
+async def get_reels_feed(
+    skip: int = 0,
+    limit: int = 10,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    return await get_reel_feed(current_user.id, skip, limit, db)
+
+@router.post("/reels/{reel_id}/view")
+async def view_reel(
+    reel_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    return await mark_reel_viewed(reel_id, current_user.id, db)
+
+@router.get("/reels/{user_id}", response_model=List[ReelOut], dependencies=[Depends(cache_control(PRIVATE_REVALIDATE))])
 async def get_user_reels_endpoint(
     user_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_async_session)
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    return await get_user_reels(user_id, skip, limit, db)
+    # The like flags make the body per viewer; a like bumps the reel's updated_at
+    version = await get_user_reels_version(user_id, db)
+    cached = not_modified(
+        request, response, weak_etag("user-reels", user_id, current_user.id, skip, limit, *version)
+    )
+    if cached is not None:
+        return cached
+    return await get_user_reels(user_id, skip, limit, db, current_user.id)
 
-@router.get("/reels")
+@router.get("/reels", response_model=List[ReelOut])
 async def get_all_reels_endpoint(
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_async_session)
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    return await get_all_reels(skip, limit, db)
+    return await get_all_reels(skip, limit, db, current_user.id)
 
 @router.put("/reels/{reel_id}")
 async def update_reel_endpoint(
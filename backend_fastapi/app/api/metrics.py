@@ -0,0 +1,88 @@
+import hmac
+from typing import Iterable, List, Tuple
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.database import get_pool_metrics
+from app.services.media_gc import media_gc_metrics
+from app.services.story import reaper_metrics
+from app.utils.query_stats import route_metrics
+from app.utils.singleflight import coalescing_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+# route_metrics() key -> metric name, type, help
+ROUTE_METRICS = (
+    ("requests", "http_requests_total", "counter", "HTTP requests handled"),
+    ("request_seconds", "http_request_seconds_total", "counter", "Time spent handling requests"),
+    ("queries", "http_db_queries_total", "counter", "SQL statements run by requests"),
+    ("db_seconds", "http_db_seconds_total", "counter", "Time spent in SQL statements"),
+    ("pool_wait_seconds", "http_db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection"),
+    ("max_queries", "http_db_queries_max", "gauge", "Most SQL statements run by a single request"),
+    ("max_query_seconds", "http_db_query_seconds_max", "gauge", "Slowest single SQL statement"),
+)
+POOL_COUNTERS = {"connects", "checkouts", "checkins", "timeouts", "acquire_seconds_total"}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str, samples: Iterable[Tuple[dict, float]]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+        lines.append(f"{name}{{{label_text}}} {float(value)}" if label_text else f"{name} {float(value)}")
+
+
+def render_metrics() -> str:
+    """Prometheus text format of this worker process's counters"""
+    lines: List[str] = []
+
+    routes = route_metrics()
+    for key, name, kind, help_text in ROUTE_METRICS:
+        _metric(lines, name, kind, help_text, [
+            ({"method": method, "route": route}, totals[key])
+            for (method, route), totals in routes.items()
+        ])
+
+    pool = get_pool_metrics()
+    replica = pool.pop("replica", {})
+    for prefix, values in (("db_pool", pool), ("db_replica_pool", replica)):
+        for key, value in values.items():
+            if key == "pool_class":
+                continue
+            _metric(
+                lines, f"{prefix}_{key}", "counter" if key in POOL_COUNTERS else "gauge",
+                f"Connection pool {key.replace('_', ' ')}", [({}, value)]
+            )
+
+    flights = coalescing_metrics()
+    for key, name, kind in (
+        ("requests", "coalescing_requests_total", "counter"),
+        ("executions", "coalescing_executions_total", "counter"),
+        ("in_flight", "coalescing_in_flight", "gauge"),
+    ):
+        _metric(lines, name, kind, f"Single-flight {key.replace('_', ' ')} per call site", [
+            ({"name": site}, values[key]) for site, values in flights.items()
+        ])
+
+    for prefix, values in (("story_reaper", reaper_metrics), ("media_gc", media_gc_metrics)):
+        for key, value in values.items():
+            _metric(lines, f"{prefix}_{key}", "gauge", f"{prefix.replace('_', ' ')} {key.replace('_', ' ')}", [({}, value)])
+
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(request: Request):
+    # Counters are per worker process: each scrape sees the worker that served it.
+    # Disabled unless METRICS_TOKEN is set, since they expose routes and SQL timings.
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -9,8 +9,9 @@ from app.services.auth import get_current_active_user
 from app.models.user import User
 from app.schemas.notification import NotificationOut
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_async_session
+from app.database import get_async_session, get_read_session
 from app.schemas.user import UserOut
+from app.utils.fast_json import FastJSONResponse
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -20,7 +21,7 @@ async def get_my_notifications(
         skip: int = 0,
         limit: int = 10,
         current_user: User = Depends(get_current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     return await get_user_notifications(current_user.id, skip, limit, db)
 
@@ -40,9 +41,9 @@ async def mark_all_as_read(
 ):
     return await mark_all_notifications_as_read(current_user.id, db)
 
-@router.get("/unread-count")
+@router.get("/unread-count", response_class=FastJSONResponse)
 async def get_my_unread_count(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await get_unread_notification_count(current_user.id, db)
\ No newline at end of file
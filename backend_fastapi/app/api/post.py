@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, Request, Response
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_async_session
-from app.schemas.post import PostCreate, PostUpdate, PostOut
+from app.database import get_async_session, get_read_session
+from app.schemas.post import PostCreate, PostUpdate, PostOut, PostListItem, ProfileGridPage
 from app.services.post import (
     create_post,
     get_posts_for_user,
-    update_post, delete_post, get_all_posts, get_post_by_id_service
+    get_profile_grid,
+    update_post, delete_post, get_all_posts, get_post_by_id_service, get_post_version
 )
+from app.utils.http_cache import cache_control, not_modified, weak_etag, PRIVATE_REVALIDATE
 from app.services.auth import get_current_active_user, get_current_admin_user
 from app.models.user import User
 
@@ -41,13 +43,13 @@ async def create_new_post(
     )
 
 
-@router.get("/", response_model=List[PostOut])
+@router.get("/", response_model=List[PostListItem])
 async def read_all_posts(
         current_user: User = Depends(get_current_active_user),
         skip: int = 0,
         limit: int = 10,
         include_private: bool = False,
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     return await get_all_posts(
         current_user_id=current_user.id,
@@ -59,13 +61,24 @@ async def read_all_posts(
 
 
 
-@router.get("/{user_id}", response_model=List[PostOut])
+@router.get("/{user_id}/grid", response_model=ProfileGridPage)
+async def read_profile_grid(
+    user_id: int,
+    before: Optional[str] = None,
+    limit: int = Query(12, ge=1, le=60),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    return await get_profile_grid(user_id, current_user.id, db, before=before, limit=limit)
+
+
+@router.get("/{user_id}", response_model=List[PostListItem])
 async def read_user_posts(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await get_posts_for_user(
         user_id=user_id,
@@ -76,13 +89,20 @@ async def read_user_posts(
     )
 
 
-@router.get("/post/{post_id}", response_model=PostOut)
+@router.get("/post/{post_id}", response_model=PostOut, dependencies=[Depends(cache_control(PRIVATE_REVALIDATE))])
 async def get_post_by_id(
     post_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session)
 ):
-    post = await get_post_by_id_service(post_id, db)  # You need to implement this service
+    version = await get_post_version(post_id, db)
+    if version is not None:
+        cached = not_modified(request, response, weak_etag("post", post_id, *version))
+        if cached is not None:
+            return cached
+    post = await get_post_by_id_service(post_id, db, version)
     if not post:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Post not found")
@@ -1,4 +1,3 @@
-import os
 import uuid
 from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body
@@ -9,8 +8,11 @@ from app.models.user import User
 from app.schemas.user import UserOut
 from app.services.auth import get_current_active_user
 from app.database import get_async_session
-from sqlalchemy import func
-from app.models.follow import Follow
+from app.services.graph import is_following
+from app.services.follow import get_follow_counts
+from app.services.media_gc import discard_media
+from app.utils.http_cache import cache_control, PRIVATE_REVALIDATE
+from app.utils.entity_cache import user_cache
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
@@ -22,7 +24,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 async def save_profile_picture(file: UploadFile) -> str:
-    """Save profile picture to local storage and return the file path"""
+    """Save profile picture to local storage and return its URL path"""
     try:
         # Validate file type
         if not file.content_type.startswith("image/"):
@@ -41,7 +43,9 @@ async def save_profile_picture(file: UploadFile) -> str:
             content = await file.read()
             buffer.write(content)
 
-        return str(file_path)
+        return f"/static/uploads/profile_pictures/{unique_filename}"
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -51,8 +55,7 @@ async def save_profile_picture(file: UploadFile) -> str:
 
 @router.get("/me", response_model=UserOut)
 async def get_my_profile(current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_async_session)):
-    followers_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.following_id == current_user.id))
-    following_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.follower_id == current_user.id))
+    followers_count, following_count = await get_follow_counts(current_user.id, db)
     user_out = UserOut.from_orm(current_user)
     user_out.followers_count = followers_count
     user_out.following_count = following_count
@@ -70,41 +73,46 @@ async def get_my_profile(current_user: User = Depends(get_current_active_user),
     return user_out
 
 
-@router.get("/{username}", response_model=UserOut)
+@router.get("/{username}", response_model=UserOut, dependencies=[Depends(cache_control(PRIVATE_REVALIDATE))])
 async def get_user_by_username(
     username: str,
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user)
 ):
-    result = await db.execute(
-        select(User).where(User.username == username)
-    )
-    user = result.scalars().first()
+    async def load():
+        result = await db.execute(
+            select(User).where(User.username == username)
+        )
+        user = result.scalars().first()
+        return UserOut.model_validate(user).model_dump(mode="json") if user else None
+
+    # The user row comes from the entity cache, checked against the row's
+    # id and updated_at; counts and follow state are per request
+    version = (await db.execute(
+        select(User.id, User.updated_at).where(User.username == username)
+    )).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = await user_cache.get_or_load(f"username:{username}", load, version)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    followers_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.following_id == user.id))
-    following_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.follower_id == user.id))
+    user_out = UserOut.model_validate(user)
+    followers_count, following_count = await get_follow_counts(user_out.id, db)
     is_followed_by_current_user = False
     if current_user:
-        is_followed_by_current_user = await db.scalar(
-            select(func.count()).select_from(Follow).where(
-                Follow.follower_id == current_user.id,
-                Follow.following_id == user.id
-            )
-        ) > 0
-    user_out = UserOut.from_orm(user)
+        is_followed_by_current_user = await is_following(current_user.id, user_out.id, db)
     user_out.followers_count = followers_count
     user_out.following_count = following_count
     user_out.is_followed_by_current_user = is_followed_by_current_user
     # Ensure profile_picture is a web path if it exists
-    if user.profile_picture and not user.profile_picture.startswith(("/", "http://", "https://")):
-        parts = Path(user.profile_picture).parts
+    if user_out.profile_picture and not user_out.profile_picture.startswith(("/", "http://", "https://")):
+        parts = Path(user_out.profile_picture).parts
         if len(parts) >= 3:
             user_out.profile_picture = "/" + "/".join(parts[-3:])
         else:
             user_out.profile_picture = None
-    elif user.profile_picture:
-        user_out.profile_picture = user.profile_picture.replace("\\", "/")
+    elif user_out.profile_picture:
+        user_out.profile_picture = user_out.profile_picture.replace("\\", "/")
 
     return user_out
 
@@ -120,28 +128,15 @@ async def edit_my_profile(
 ):
     # Handle profile picture upload
     if profile_picture is not None and profile_picture.filename:
-        # Delete old profile picture if exists
-        # Important: os.path.exists expects a file system path, not a URL
-        old_picture_system_path = None
-        if current_user.profile_picture:
-            if current_user.profile_picture.startswith("/static/"):
-                old_picture_system_path = Path(current_user.profile_picture[1:]) # Remove leading '/' to make it relative to project root
-            else:
-                # If it's an old system path, use it directly (less likely with new changes)
-                old_picture_system_path = Path(current_user.profile_picture)
-        
-        if old_picture_system_path and old_picture_system_path.exists():
-            try:
-                os.remove(old_picture_system_path)
-            except OSError as e:
-                print(f"Error deleting old profile picture: {e}") # Log error
-                pass
+        # The old picture is removed by the media sweeper after the commit
+        discard_media(db, current_user.profile_picture)
 
         # Save new profile picture (this now returns a web path)
         picture_web_path = await save_profile_picture(profile_picture)
         current_user.profile_picture = picture_web_path # Store the web path
 
     await db.commit()
+    await user_cache.invalidate(f"id:{current_user.id}", f"username:{current_user.username}")
     await db.refresh(current_user)
     
     # Construct UserOut ensuring the profile_picture is a web path
@@ -156,8 +151,7 @@ async def edit_my_profile(
         user_response.profile_picture = current_user.profile_picture.replace("\\", "/")
 
     # Recalculate counts for the response as they might not be on current_user directly after refresh
-    followers_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.following_id == current_user.id))
-    following_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.follower_id == current_user.id))
+    followers_count, following_count = await get_follow_counts(current_user.id, db)
     user_response.followers_count = followers_count
     user_response.following_count = following_count
     user_response.is_followed_by_current_user = True # For /me endpoint
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Response
 from app.services.search import (
     search_users,
     search_posts,
     get_trending_posts,
+    get_trending_reels,
     get_recommended_users
 )
-from app.services.auth import get_current_active_user
+from app.services.hashtag import get_posts_by_hashtag, get_trending_hashtags
+from app.services.auth import get_current_active_user, get_optional_active_user
 from app.models.user import User
 from app.schemas.user import UserOut
-from app.schemas.post import PostOut
+from app.schemas.post import PostListItem
+from app.schemas.reel import ReelOut
+from app.schemas.hashtag import HashtagOut, HashtagPostsPage
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_async_session
+from app.database import get_async_session, get_read_session
+from app.utils.http_cache import cache_control, public, PRIVATE_REVALIDATE
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
@@ -19,28 +25,40 @@ async def search_users_by_query(
     query: str,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await search_users(query, skip, limit, db)
 
-@router.get("/posts", response_model=list[PostOut])
+@router.get("/posts", response_model=list[PostListItem])
 async def search_posts_by_query(
     query: str,
     current_user: User = Depends(get_current_active_user),
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await search_posts(query, current_user.id, skip, limit, db)
 
-@router.get("/trending", response_model=list[PostOut])
+@router.get("/trending", response_model=list[PostListItem], dependencies=[Depends(cache_control(public(30)))])
 async def get_trending_posts_list(
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     return await get_trending_posts(skip, limit, db)
 
+@router.get("/trending/reels", response_model=list[ReelOut])
+async def get_trending_reels_list(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    current_user: Optional[User] = Depends(get_optional_active_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    # Signed-in viewers get their own like flags, so only anonymous pages are shared
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE if current_user else public(30)
+    return await get_trending_reels(skip, limit, db, current_user.id if current_user else None)
+
 @router.get("/recommended-users", response_model=list[UserOut])
 async def get_recommended_users_list(
     current_user: User = Depends(get_current_active_user),
@@ -48,4 +66,22 @@ async def get_recommended_users_list(
     limit: int = 5,
     db: AsyncSession = Depends(get_async_session)
 ):
-    return await get_recommended_users(current_user.id, skip, limit, db)
\ No newline at end of file
+    return await get_recommended_users(current_user.id, skip, limit, db)
+
+@router.get("/hashtags/trending", response_model=list[HashtagOut])
+async def get_trending_hashtags_list(
+    limit: int = 10,
+    hours: int = 24,
+    db: AsyncSession = Depends(get_read_session)
+):
+    return await get_trending_hashtags(limit, hours, db)
+
+@router.get("/hashtags/{tag}/posts", response_model=HashtagPostsPage)
+async def get_hashtag_posts(
+    tag: str,
+    before_id: Optional[int] = None,
+    limit: int = 12,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session)
+):
+    return await get_posts_by_hashtag(tag, current_user.id, db, before_id=before_id, limit=limit)
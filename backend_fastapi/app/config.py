@@ -21,6 +21,89 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Read replica for read-only endpoints; unset sends everything to DATABASE_URL
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # How long a client's reads stay on the primary after it writes
+    DB_READ_YOUR_WRITES_SECONDS: int = 10
+    DB_ECHO: bool = False
+    DB_APPLICATION_NAME: str = "insta-clone-api"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Connections all workers of one instance may hold per database; each
+    # worker's pool_size + max_overflow is capped to its share
+    DB_MAX_CONNECTIONS: int = 60
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 keeps the server default
+    DB_COMMAND_TIMEOUT_SECONDS: int = 0
+    # PgBouncer (transaction mode) in front of Postgres: no local pool, no
+    # server-side statement cache, no per-connection session settings
+    DB_EXTERNAL_POOLER: bool = False
+    # Statements slower than this are logged; 0 disables the log
+    DB_SLOW_QUERY_MS: int = 500
+
+    # Server launcher (python -m app.server)
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 2  # 0 uses one worker per available CPU
+    WEB_BACKLOG: int = 2048
+    WEB_KEEPALIVE_SECONDS: int = 5
+    WEB_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    # Connections each worker opens at startup, before taking traffic
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
+    # Only the worker holding this lock runs the periodic jobs on a host
+    # (the trending refresh runs in every worker)
+    JOB_LOCK_FILE: str = "/tmp/insta-clone-jobs.lock"
+
+    # Trending
+    TRENDING_REFRESH_SECONDS: int = 300
+    TRENDING_WINDOW_HOURS: int = 48
+    TRENDING_SIZE: int = 500
+
+    # People you may know
+    RECOMMENDATION_REFRESH_SECONDS: int = 60
+    RECOMMENDATION_MAX_AGE_HOURS: int = 24
+    RECOMMENDATION_BATCH_SIZE: int = 100
+    RECOMMENDATION_POOL_SIZE: int = 50
+    RECOMMENDATION_CACHE_SIZE: int = 10000
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 300
+
+    # Social graph cache
+    GRAPH_CACHE_SIZE: int = 50000
+    GRAPH_CACHE_TTL_SECONDS: int = 60
+    GRAPH_INLINE_LIMIT: int = 5000
+
+    # Story tray cache
+    STORY_TRAY_CACHE_SIZE: int = 10000
+    STORY_TRAY_CACHE_TTL_SECONDS: int = 60
+
+    # Expired story reaper
+    STORY_REAPER_INTERVAL_SECONDS: int = 60
+    STORY_REAPER_BATCH_SIZE: int = 500
+    MEDIA_DELETE_CONCURRENCY: int = 16
+
+    # Media garbage collection
+    MEDIA_GC_INTERVAL_SECONDS: int = 60
+    MEDIA_GC_BATCH_SIZE: int = 500
+    MEDIA_ORPHAN_SCAN_INTERVAL_SECONDS: int = 0  # 0 disables the scan
+    MEDIA_ORPHAN_GRACE_SECONDS: int = 3600
+
+    # Personalized reels feed
+    REEL_FEED_CANDIDATES: int = 500
+    REEL_FEED_MAX_AGE_HOURS: int = 72
+    REEL_FEED_CACHE_SIZE: int = 10000
+    REEL_FEED_CACHE_TTL_SECONDS: int = 600
+
+    # Entity read-through cache; REDIS_URL enables the shared tier
+    ENTITY_CACHE_SIZE: int = 10000
+    ENTITY_CACHE_TTL_SECONDS: int = 30
+    REDIS_URL: Optional[str] = None
+
+    # Bearer token required by GET /metrics; the endpoint is disabled (404) until it is set
+    METRICS_TOKEN: Optional[str] = None
 
     # File Upload Constraints
     MAX_FILE_SIZE_MB: int = 10
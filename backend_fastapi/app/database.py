@@ -1,16 +1,235 @@
+import asyncio
+import logging
+import time
+from uuid import uuid4
 from typing import AsyncGenerator
+from fastapi import Depends, Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.query_stats import install_query_listeners, record_pool_wait
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
-engine = create_async_engine(settings.DATABASE_URL,future=True,echo=True,pool_size=10,max_overflow=20,pool_timeout=30)
+# Pool counters since process start, see get_pool_metrics()
+pool_metrics = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "timeouts": 0,
+    "acquire_seconds_total": 0.0,
+    "acquire_seconds_max": 0.0,
+}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            pool_metrics["acquire_seconds_total"] += waited
+            pool_metrics["acquire_seconds_max"] = max(pool_metrics["acquire_seconds_max"], waited)
+            record_pool_wait(waited)
+
+
+def _connect_args(url) -> dict:
+    """Driver-level options; only asyncpg understands these"""
+    if make_url(url).get_driver_name() != "asyncpg":
+        return {}
+    server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+    if settings.DB_EXTERNAL_POOLER:
+        # Server connections are shared between clients, so nothing may be
+        # prepared or set per connection. Startup parameters other than
+        # application_name are rejected by PgBouncer; set statement_timeout
+        # on the database role instead.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unnamed statements can still collide across server connections
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            "command_timeout": settings.DB_COMMAND_TIMEOUT_SECONDS or None,
+            "server_settings": server_settings,
+        }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    return {
+        # asyncpg's own server-side prepared statement cache
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # SQLAlchemy's cache of prepared statements per connection
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT_SECONDS or None,
+        "server_settings": server_settings,
+    }
+
+
+def _pool_options() -> dict:
+    if settings.DB_EXTERNAL_POOLER:
+        # The pooler owns the connections; holding idle ones here would pin
+        # server connections and defeat transaction pooling
+        return {"poolclass": NullPool}
+    # app.server exports the worker count it launched with, so N workers
+    # together stay within DB_MAX_CONNECTIONS
+    per_worker = max(1, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_WORKERS))
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": min(settings.DB_MAX_OVERFLOW, per_worker - pool_size),
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _build_engine(url: str):
+    engine = create_async_engine(
+        url,
+        future=True,
+        echo=settings.DB_ECHO,
+        connect_args=_connect_args(url),
+        **_pool_options(),
+    )
+
+    install_query_listeners(engine.sync_engine)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_metrics["connects"] += 1
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics["checkouts"] += 1
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_metrics["checkins"] += 1
+
+    return engine
+
+
+engine = _build_engine(settings.DATABASE_URL)
+# Without a replica, reads share the primary engine
+replica_engine = _build_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
 
 async_session_maker = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+replica_session_maker = sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Epoch second until which the client reads from the primary
+PRIMARY_PIN_COOKIE = "db_primary_until"
+# Same pin keyed by credentials, for clients that drop cookies (this worker only)
+_pinned_clients = TTLCache(maxsize=10000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+def _client_key(request: Request):
+    return request.headers.get("authorization") or request.cookies.get("access_token")
+
+
+def _pin_to_primary(request: Request, response: Response) -> None:
+    """Keep this client's reads on the primary until the replica has caught up"""
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        PRIMARY_PIN_COOKIE, str(int(time.time()) + window),
+        max_age=window, httponly=True, samesite="lax"
+    )
+    key = _client_key(request)
+    if key:
+        _pinned_clients.set(key, True)
+
+
+def _pinned_to_primary(request: Request) -> bool:
+    if request.method not in SAFE_METHODS:
+        return True
+    try:
+        if int(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    key = _client_key(request)
+    return bool(key) and _pinned_clients.get(key, False)
+
+
+async def get_async_session(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """Primary session. Any non-safe request using it counts as a write."""
+    if replica_engine is not engine and request.method not in SAFE_METHODS:
+        _pin_to_primary(request, response)
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_session(
+    request: Request,
+    primary: AsyncSession = Depends(get_async_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints: bound to the replica, unless the request
+    itself writes or the client wrote within DB_READ_YOUR_WRITES_SECONDS.
+    Sessions only take a connection on first use, so the unused primary
+    session costs nothing.
+    """
+    if replica_engine is engine or _pinned_to_primary(request):
+        yield primary
+        return
+    async with replica_session_maker() as session:
+        yield session
+
+
+async def warm_up_pool(connections: int) -> None:
+    """Open pooled connections ahead of the first requests"""
+    if connections <= 0 or isinstance(engine.sync_engine.pool, NullPool):
+        return
+
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Held concurrently, so the pool keeps `connections` distinct ones; no
+    # more than this worker's share of DB_MAX_CONNECTIONS stays open
+    try:
+        await asyncio.gather(*(touch() for _ in range(min(connections, _pool_options()["pool_size"]))))
+    except (OSError, SQLAlchemyError):
+        # Best effort: requests will connect on demand
+        logger.warning("Connection pool warm-up failed", exc_info=True)
+
+
+def _pool_state(pool) -> dict:
+    if isinstance(pool, NullPool):
+        # Every checkout is a fresh connection to the external pooler
+        return {"pool_class": "NullPool"}
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+def get_pool_metrics() -> dict:
+    """Live pool state plus the counters collected since process start"""
+    checkouts = pool_metrics["checkouts"]
+    metrics = {
+        **_pool_state(engine.sync_engine.pool),
+        # This worker's limit, after splitting DB_MAX_CONNECTIONS
+        "max_overflow": _pool_options().get("max_overflow", 0),
+        **pool_metrics,
+        "acquire_seconds_avg": pool_metrics["acquire_seconds_total"] / checkouts if checkouts else 0.0,
+    }
+    if replica_engine is not engine:
+        # The counters above cover both engines
+        metrics["replica"] = _pool_state(replica_engine.sync_engine.pool)
+    return metrics
@@ -11,10 +11,18 @@ from app.api import (
     notification,
     search,
     admin_user, 
-    profile
+    profile,
+    metrics
 )
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, engine, warm_up_pool
+from app.services.trending import refresh_trending
+from app.services.recommendation import refresh_recommendations
+from app.services.story import reap_expired_stories
+from app.services.media_gc import sweep_media_tombstones, scan_orphan_media
+from app.utils.scheduler import start_periodic_job, stop_periodic_jobs, claim_job_runner
+from app.utils.http_cache import ETagMiddleware
+from app.utils.query_stats import QueryStatsMiddleware
 import time
 from sqlalchemy.exc import OperationalError
 
@@ -23,6 +31,9 @@ app = FastAPI(title="Insta clone")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+# Weak ETags / 304s for JSON GET responses that don't set their own
+app.add_middleware(ETagMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost: per-request query count and DB time, as Server-Timing and /metrics
+app.add_middleware(QueryStatsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(profile.router)
@@ -42,10 +56,27 @@ app.include_router(media.router)
 app.include_router(notification.router)
 app.include_router(search.router)
 app.include_router(admin_user.router)
+app.include_router(metrics.router)
 
 @app.on_event("startup")
 async def startup_event():
     await create_admin_user()
+    await warm_up_pool(settings.DB_POOL_WARMUP_CONNECTIONS)
+    # The trending rankings live in each worker's memory, so every worker
+    # refreshes its own; otherwise the others would rebuild them on the
+    # request path whenever they went stale
+    start_periodic_job("trending", settings.TRENDING_REFRESH_SECONDS, refresh_trending)
+    if not claim_job_runner(settings.JOB_LOCK_FILE):
+        return
+    start_periodic_job("recommendations", settings.RECOMMENDATION_REFRESH_SECONDS, refresh_recommendations)
+    start_periodic_job("story_reaper", settings.STORY_REAPER_INTERVAL_SECONDS, reap_expired_stories)
+    start_periodic_job("media_sweeper", settings.MEDIA_GC_INTERVAL_SECONDS, sweep_media_tombstones)
+    if settings.MEDIA_ORPHAN_SCAN_INTERVAL_SECONDS > 0:
+        start_periodic_job("media_orphan_scan", settings.MEDIA_ORPHAN_SCAN_INTERVAL_SECONDS, scan_orphan_media)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_periodic_jobs()
 
 @app.get("/")
 def read_root():
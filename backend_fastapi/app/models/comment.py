@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # id breaks created_at ties for the (created_at, id) keyset pages
+        Index("ix_comments_post_parent_created", "post_id", "parent_id", "created_at", "id"),
+        Index("ix_comments_reel_parent_created", "reel_id", "parent_id", "created_at", "id"),
+        Index("ix_comments_parent_created", "parent_id", "created_at", "id"),
+        # Prefix (LIKE 'path%') lookups for whole subtrees
+        Index("ix_comments_path", "path", postgresql_ops={"path": "text_pattern_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -14,6 +22,10 @@ class Comment(Base):
     parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
     created_at = Column(DateTime, default=func.now())
     reel_id = Column(Integer, ForeignKey("reels.id"), nullable=True)
+    reply_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Materialized path: zero-padded ids of the root..self chain, each followed
+    # by "/". Sorting by path walks a thread depth-first, oldest replies first.
+    path = Column(Text, nullable=True)
 
     # Consistent relationship naming
     user = relationship("User", foreign_keys=[user_id], back_populates="comments")
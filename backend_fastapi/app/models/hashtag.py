@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class Hashtag(Base):
+    __tablename__ = "hashtags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+
+    links = relationship("HashtagLink", back_populates="hashtag", cascade="all, delete-orphan")
+
+
+class HashtagLink(Base):
+    """Inverted index row: one per (hashtag, post) or (hashtag, reel) pair."""
+    __tablename__ = "hashtag_links"
+    __table_args__ = (
+        Index("ix_hashtag_links_hashtag_post", "hashtag_id", "post_id"),
+        Index("ix_hashtag_links_hashtag_reel", "hashtag_id", "reel_id"),
+        Index("ix_hashtag_links_created_at", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    hashtag_id = Column(Integer, ForeignKey("hashtags.id", ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=True, index=True)
+    reel_id = Column(Integer, ForeignKey("reels.id", ondelete="CASCADE"), nullable=True, index=True)
+    created_at = Column(DateTime, default=func.now())
+
+    hashtag = relationship("Hashtag", back_populates="links")
+
+
+class Mention(Base):
+    __tablename__ = "mentions"
+    __table_args__ = (
+        Index("ix_mentions_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    sender_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=True, index=True)
+    reel_id = Column(Integer, ForeignKey("reels.id", ondelete="CASCADE"), nullable=True, index=True)
+    created_at = Column(DateTime, default=func.now())
+
+    user = relationship("User", foreign_keys=[user_id])
+    sender = relationship("User", foreign_keys=[sender_id])
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, func, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        Index("uq_likes_post_user", "post_id", "user_id", unique=True,
+              postgresql_where=text("post_id IS NOT NULL")),
+        Index("uq_likes_reel_user", "reel_id", "user_id", unique=True,
+              postgresql_where=text("reel_id IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.database import Base
+
+
+class MediaTombstone(Base):
+    """
+    A media file whose owning row is gone. Written in the same transaction
+    as the delete; the file itself is removed later by the media sweeper.
+    """
+    __tablename__ = "media_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    media_url = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=func.now(), index=True)
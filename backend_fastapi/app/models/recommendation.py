@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, func
+from app.database import Base
+
+
+class UserRecommendation(Base):
+    """Precomputed "people you may know" candidate for a user."""
+    __tablename__ = "user_recommendations"
+    __table_args__ = (
+        Index("ix_user_recommendations_user_score", "user_id", "score"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False, default=0)
+    computed_at = Column(DateTime, default=func.now(), index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -11,9 +11,24 @@ class Reel(Base):
     caption = Column(Text, nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=func.now())
+    # Bumped by every UPDATE (edits and counter changes); drives the ETag
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     like_count = Column(Integer, default=0, nullable=False)
     comment_count = Column(Integer, default=0, nullable=False)
 
     owner = relationship("User", back_populates="reels")
     likes = relationship("Like", back_populates="reel", cascade="all, delete-orphan")
-    comments = relationship("Comment", back_populates="reel", cascade="all, delete-orphan")
\ No newline at end of file
+    comments = relationship("Comment", back_populates="reel", cascade="all, delete-orphan")
+
+
+class ReelView(Base):
+    """One row per (reel, viewer); seen reels are left out of the ranked feed."""
+    __tablename__ = "reel_views"
+    __table_args__ = (
+        UniqueConstraint("viewer_id", "reel_id", name="uq_reel_views_viewer_reel"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    reel_id = Column(Integer, ForeignKey("reels.id", ondelete="CASCADE"), nullable=False, index=True)
+    viewer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    viewed_at = Column(DateTime, default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 from app.database import Base
@@ -6,6 +6,9 @@ from app.database import Base
 
 class Story(Base):
     __tablename__ = "stories"
+    __table_args__ = (
+        Index("ix_stories_owner_expires", "owner_id", "expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     media_url = Column(String(255), nullable=False)
@@ -14,4 +17,22 @@ class Story(Base):
     expires_at = Column(DateTime, default=lambda: func.now() + timedelta(hours=24))
 
     # Relationships
-    owner = relationship("User", back_populates="stories")
\ No newline at end of file
+    owner = relationship("User", back_populates="stories")
+
+    views = relationship("StoryView", back_populates="story", cascade="all, delete-orphan")
+
+
+class StoryView(Base):
+    """One row per (story, viewer): drives the seen/unseen state of the story tray."""
+    __tablename__ = "story_views"
+    __table_args__ = (
+        UniqueConstraint("story_id", "viewer_id", name="uq_story_views_story_viewer"),
+        Index("ix_story_views_viewer_story", "viewer_id", "story_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    story_id = Column(Integer, ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
+    viewer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    viewed_at = Column(DateTime, default=func.now())
+
+    story = relationship("Story", back_populates="views")
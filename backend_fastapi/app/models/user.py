@@ -16,6 +16,7 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     posts_count = Column(Integer, default=0, nullable=True)
     reels_count = Column(Integer, default=0, nullable=True)
     stories_count = Column(Integer, default=0, nullable=True)
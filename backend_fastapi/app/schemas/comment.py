@@ -20,9 +20,14 @@ class CommentBrief(BaseModel):
     reel_id: Optional[int] = None
     parent_id: Optional[int] = None
     created_at: datetime
+    reply_count: int = 0
     user: UserOut  # Matches the relationship name 'user'
 
     model_config = ConfigDict(from_attributes=True)
 
 class CommentOut(CommentBrief):
     replies: List[CommentBrief] = Field(default_factory=list)
+
+
+class CommentNode(CommentBrief):
+    depth: int = 0
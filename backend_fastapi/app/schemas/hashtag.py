@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.schemas.post import PostOut
+
+
+class HashtagOut(BaseModel):
+    name: str
+    uses: int
+
+
+class HashtagPostsPage(BaseModel):
+    tag: str
+    posts: List[PostOut] = Field(default_factory=list)
+    next_cursor: Optional[int] = None
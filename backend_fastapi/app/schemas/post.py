@@ -1,7 +1,15 @@
 from pydantic import BaseModel, Field, AnyUrl, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from app.schemas.user import UserOut
+from app.schemas.user import UserOut, UserSummary
+
+def absolute_media_url(value):
+    if value and isinstance(value, str):
+        if value.startswith('/'):
+            return f"http://localhost:8000{value}"  # Adjust with your actual domain
+        return value
+    return value
+
 
 class PostBase(BaseModel):
     caption: Optional[str] = Field(None, max_length=2000)
@@ -27,8 +35,29 @@ class PostOut(PostBase):
 
     @field_validator('image_url', 'video_url', mode='before')
     def convert_path_to_url(cls, value):
-        if value and isinstance(value, str):
-            if value.startswith('/'):
-                return f"http://localhost:8000{value}"  # Adjust with your actual domain
-            return value
-        return value
+        return absolute_media_url(value)
+
+
+class PostListItem(PostOut):
+    """Post as listed in feeds, search and trending, with a compact owner"""
+    owner: UserSummary
+
+
+class ProfileGridItem(BaseModel):
+    """Tile of a profile grid: what the thumbnail needs and the counts"""
+    id: int
+    thumbnail_url: Optional[AnyUrl] = None  # the image, or the video for video-only posts
+    is_video: bool
+    is_private: bool
+    like_count: int
+    comment_count: int
+    created_at: datetime
+
+    @field_validator('thumbnail_url', mode='before')
+    def convert_path_to_url(cls, value):
+        return absolute_media_url(value)
+
+
+class ProfileGridPage(BaseModel):
+    posts: List[ProfileGridItem] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from app.schemas.user import UserOut
+from app.schemas.user import UserOut, UserSummary
 
 
 class ReelBase(BaseModel):
@@ -24,4 +24,9 @@ class ReelOut(ReelBase):
     is_liked_by_current_user: Optional[bool] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ReelListItem(ReelOut):
+    """Reel with a compact owner, for admin listings"""
+    owner: UserSummary
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from app.schemas.user import UserOut
+from app.schemas.user import UserOut, UserSummary
 from typing import Optional
 
 class StoryBase(BaseModel):
@@ -15,4 +15,29 @@ class StoryOut(StoryBase):
     owner: UserOut
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class StoryItem(BaseModel):
+    """Story without its owner, as listed for one user or the following feed"""
+    id: int
+    media_url: str
+    owner_id: int
+    created_at: datetime
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class StoryListItem(StoryOut):
+    """Story with a compact owner, for admin listings"""
+    owner: UserSummary
+
+
+class StoryTrayItem(BaseModel):
+    """One author in the story tray"""
+    owner: UserOut
+    story_count: int
+    latest_story_at: datetime
+    has_unseen: bool
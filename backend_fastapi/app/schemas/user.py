@@ -40,6 +40,15 @@ class UserOut(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)  # Correct for Pydantic v2
 
+class UserSummary(BaseModel):
+    """Compact owner shown on list items"""
+    id: int
+    username: str
+    full_name: Optional[str] = None
+    profile_picture: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 # Only for internal use (not API responses)
 class UserInDB(UserOut):
     hashed_password: str
@@ -0,0 +1,57 @@
+"""
+Production launcher: WEB_WORKERS uvicorn worker processes (0 for one per
+CPU), on uvloop and httptools when they are installed.
+
+    python -m app.server [--workers N] [--host HOST] [--port PORT]
+"""
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+
+from app.config import settings
+
+
+def default_workers() -> int:
+    """CPUs this process may run on, which respects container cpusets"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def run(workers: int, host: str, port: int) -> None:
+    # Workers read this back through settings to size their pools
+    os.environ["WEB_WORKERS"] = str(workers)
+
+    # Import once in the parent so a broken config or import fails here,
+    # before any worker is spawned
+    import app.main  # noqa: F401
+
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        backlog=settings.WEB_BACKLOG,
+        timeout_keep_alive=settings.WEB_KEEPALIVE_SECONDS,
+        # In-flight requests get this long to finish on SIGTERM
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or default_workers())
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    args = parser.parse_args()
+    run(args.workers, args.host, args.port)
@@ -7,7 +7,7 @@ from pydantic import EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_async_session
+from app.database import get_read_session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut
 from app.config import settings
@@ -80,7 +80,7 @@ async def get_token_from_request(request: Request):
         return cookie_token.split(" ", 1)[1]
     return None
 
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_session)):
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_read_session)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -126,6 +126,13 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     return current_user
 
 
+async def get_optional_active_user(request: Request, db: AsyncSession = Depends(get_read_session)) -> Optional[User]:
+    """The active user for requests carrying credentials, None for anonymous ones"""
+    if request.cookies.get("access_token") is None and not request.headers.get("Authorization"):
+        return None
+    return await get_current_active_user(await get_current_user(request, db))
+
+
 async def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
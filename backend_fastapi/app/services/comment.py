@@ -1,337 +1,467 @@
 from fastapi import HTTPException
-from sqlalchemy import select, update, func, delete
+from typing import Optional
+from sqlalchemy import select, insert, update, func, delete, tuple_, literal, exists, cast, Integer, Text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
 from app.models.comment import Comment
 from app.models.post import Post
-from app.schemas.comment import CommentOut, CommentBrief
+from app.models.user import User
+from app.schemas.comment import CommentOut, CommentBrief, CommentNode
 from app.schemas.user import UserOut
 from app.services.notification import create_notification
 from app.models.notification import Notification
 from app.models.reel import Reel
+from app.utils.entity_cache import post_cache, reel_cache
+from app.utils.singleflight import coalesce
 
 
-async def create_comment(post_id: int, user_id: int, content: str, parent_id: int = None, db: AsyncSession = None):
-    """Create a new comment or reply to a comment."""
-    if db is None:
-        raise ValueError("Database session is required")
+# Comment threads hang off either a post or a reel; everything below is
+# shared and only picks the target model and foreign key from this table.
+TARGETS = {
+    "post": (Post, Comment.post_id),
+    "reel": (Reel, Comment.reel_id),
+}
+# Cached post/reel bodies carry comment_count
+TARGET_CACHES = {
+    "post": post_cache,
+    "reel": reel_cache,
+}
 
-    # Check if post exists
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalars().first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
+# Width of each id segment in Comment.path; keeps lexical order == numeric order
+PATH_SEGMENT_WIDTH = 10
 
-    # If it's a reply, check if parent comment exists
-    if parent_id:
-        result = await db.execute(select(Comment).where(Comment.id == parent_id))
-        parent_comment = result.scalars().first()
-        if not parent_comment:
-            raise HTTPException(status_code=404, detail="Parent comment not found")
 
-    # Create new comment
-    new_comment = Comment(
-        content=content,
-        user_id=user_id,
-        post_id=post_id,
-        parent_id=parent_id
+def _path_segment(comment_id):
+    """SQL expression for the zero-padded path segment of `comment_id`."""
+    return func.lpad(cast(comment_id, Text), PATH_SEGMENT_WIDTH, "0") + "/"
+
+
+def _subtree(comment: Comment):
+    """Criterion matching `comment` and all of its descendants."""
+    if comment.path is None:
+        return Comment.id == comment.id
+    return Comment.path.like(f"{comment.path}%")
+
+
+def _keyset_before(cursor_id: int):
+    """Comments ordered before `cursor_id` in (created_at DESC, id DESC) order."""
+    cursor = aliased(Comment)
+    return tuple_(Comment.created_at, Comment.id) < (
+        select(cursor.created_at, cursor.id).where(cursor.id == cursor_id).scalar_subquery()
     )
 
-    db.add(new_comment)
-    await db.flush()
-    await db.refresh(new_comment)
 
+def _keyset_after(cursor_id: int):
+    """Comments ordered after `cursor_id` in (created_at ASC, id ASC) order."""
+    cursor = aliased(Comment)
+    return tuple_(Comment.created_at, Comment.id) > (
+        select(cursor.created_at, cursor.id).where(cursor.id == cursor_id).scalar_subquery()
+    )
 
-    # Increment comment_count on the post
-    # Only increment for top-level comments (not replies)
-    if parent_id is None:
-        await db.execute(
-            update(Post)
-            .where(Post.id == post_id)
-            .values(comment_count=Post.comment_count + 1)
-        )
 
-    await db.commit()
-    await db.refresh(new_comment)
+async def _load_authors(comments, db: AsyncSession) -> dict:
+    """Authors of all given comments in a single query, keyed by user id."""
+    user_ids = {comment.user_id for comment in comments}
+    if not user_ids:
+        return {}
+    result = await db.execute(select(User).where(User.id.in_(user_ids)))
+    return {user.id: UserOut.model_validate(user) for user in result.scalars().all()}
+
+
+def _to_brief(comment: Comment, author: UserOut) -> CommentBrief:
+    return CommentBrief(
+        id=comment.id,
+        content=comment.content,
+        user_id=comment.user_id,
+        post_id=comment.post_id,
+        reel_id=comment.reel_id,
+        parent_id=comment.parent_id,
+        created_at=comment.created_at,
+        reply_count=comment.reply_count,
+        user=author
+    )
 
-    if post.owner_id != user_id:
-        await create_notification(
-            user_id=post.owner_id,
-            sender_id=user_id,
-            notification_type="comment",
-            post_id=post_id,
-            comment_id=new_comment.id,
-            db=db
+
+async def _get_reply_previews(comment_ids: list, replies_limit: int, db: AsyncSession) -> dict:
+    """First `replies_limit` replies of each comment, grouped by parent_id."""
+    replies_by_parent = {}
+    if not comment_ids or replies_limit <= 0:
+        return replies_by_parent
+
+    row_number = func.row_number().over(
+        partition_by=Comment.parent_id,
+        order_by=(Comment.created_at.asc(), Comment.id.asc())
+    ).label("row_number")
+    ranked = (
+        select(Comment.id, row_number)
+        .where(Comment.parent_id.in_(comment_ids))
+        .subquery()
+    )
+    result = await db.execute(
+        select(Comment)
+        .join(ranked, ranked.c.id == Comment.id)
+        .where(ranked.c.row_number <= replies_limit)
+        .order_by(Comment.parent_id, Comment.created_at.asc(), Comment.id.asc())
+    )
+    for reply in result.scalars().all():
+        replies_by_parent.setdefault(reply.parent_id, []).append(reply)
+    return replies_by_parent
+
+
+async def _create_comment(
+        target: str,
+        target_id: int,
+        user_id: int,
+        content: str,
+        parent_id: Optional[int],
+        db: AsyncSession
+) -> CommentBrief:
+    """
+    Insert a comment with a single statement: the target/parent existence
+    checks, the INSERT (id and materialized path included) and the counter
+    bump run as one CTE, and the notifications are flushed with the same commit.
+    """
+    if db is None:
+        raise ValueError("Database session is required")
+    model, target_column = TARGETS[target]
+    if target_id is None:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+
+    target_row = select(model.id, model.owner_id).where(model.id == target_id).cte("target")
+    # The id is drawn up front so the path can be written by the INSERT itself
+    new_id = select(
+        func.nextval(func.pg_get_serial_sequence(Comment.__tablename__, "id")).label("id")
+    ).cte("new_id")
+    sources = [target_row, new_id]
+    parent_author = literal(None, Integer)
+    path = _path_segment(new_id.c.id)
+    if parent_id:
+        parent_row = (
+            select(Comment.id, Comment.user_id, Comment.path)
+            .where(Comment.id == parent_id, target_column == target_id)
+            .cte("parent")
+        )
+        sources.append(parent_row)
+        parent_author = parent_row.c.user_id
+        path = parent_row.c.path + path
+
+    # No row is inserted when the target (or parent) does not exist
+    inserted = (
+        insert(Comment)
+        .from_select(
+            ["id", "content", "user_id", target_column.key, "parent_id", "path"],
+            select(
+                new_id.c.id,
+                literal(content, Text),
+                literal(user_id, Integer),
+                target_row.c.id,
+                literal(parent_id, Integer),
+                path
+            ).select_from(*sources)
+        )
+        .returning(Comment.id, Comment.created_at)
+        .cte("inserted")
+    )
+    # Top-level comments count towards the post/reel, replies towards their parent
+    if parent_id:
+        counter = (
+            update(Comment)
+            .where(Comment.id == parent_id, exists(select(inserted.c.id)))
+            .values(reply_count=Comment.reply_count + 1)
+            .returning(Comment.id)
+            .cte("counter")
+        )
+    else:
+        counter = (
+            update(model)
+            .where(model.id == target_id, exists(select(inserted.c.id)))
+            .values(comment_count=model.comment_count + 1)
+            .returning(model.id)
+            .cte("counter")
         )
-    # Optionally, notify parent comment owner if it's a reply and not self
-    if parent_id and parent_comment.user_id != user_id:
+    # Selecting from the counter CTE (one row whenever a comment was inserted)
+    # keeps it in the statement
+    result = await db.execute(
+        select(inserted.c.id, inserted.c.created_at, target_row.c.owner_id, parent_author)
+        .select_from(inserted, counter, *sources)
+    )
+    row = result.first()
+    if row is None:
+        if not parent_id or await db.get(model, target_id) is None:
+            raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+        raise HTTPException(status_code=404, detail="Parent comment not found")
+    comment_id, created_at, target_owner_id, parent_author_id = row
+
+    recipients = {target_owner_id}
+    if parent_author_id is not None:
+        recipients.add(parent_author_id)
+    recipients.discard(user_id)
+    for recipient_id in recipients:
         await create_notification(
-            user_id=parent_comment.user_id,
+            user_id=recipient_id,
             sender_id=user_id,
             notification_type="comment",
-            post_id=post_id,
-            comment_id=new_comment.id,
-            db=db
+            comment_id=comment_id,
+            db=db,
+            commit=False,
+            **{target_column.key: target_id}
         )
 
-    return new_comment
+    # The author is the current user, already in the session's identity map
+    author = UserOut.model_validate(await db.get(User, user_id))
+    await db.commit()
+    if not parent_id:
+        await TARGET_CACHES[target].invalidate(target_id)
+
+    return CommentBrief(
+        id=comment_id,
+        content=content,
+        user_id=user_id,
+        parent_id=parent_id,
+        created_at=created_at,
+        reply_count=0,
+        user=author,
+        **{target_column.key: target_id}
+    )
 
 
-async def get_comments_for_post(post_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None):
-    """Get all top-level comments for a post with pagination."""
+async def _get_thread(
+        target: str,
+        target_id: int,
+        skip: int,
+        limit: int,
+        db: AsyncSession,
+        before_id: Optional[int],
+        replies_limit: int
+) -> list[CommentOut]:
     if db is None:
         raise ValueError("Database session is required")
+    _, target_column = TARGETS[target]
 
-    # Get top-level comments with user relationship loaded
-    result = await db.execute(
+    query = (
         select(Comment)
-        .where(Comment.post_id == post_id, Comment.parent_id == None)
-        .options(selectinload(Comment.user))
-        .order_by(Comment.created_at.desc())
-        .offset(skip)
+        .where(target_column == target_id, Comment.parent_id == None)
+        .order_by(Comment.created_at.desc(), Comment.id.desc())
         .limit(limit)
     )
+    if before_id is not None:
+        query = query.where(_keyset_before(before_id))
+    elif skip:
+        query = query.offset(skip)
+    result = await db.execute(query)
     comments = result.scalars().all()
 
-    # Get comment IDs
-    comment_ids = [comment.id for comment in comments]
-
-    # Get all replies with user relationship loaded
-    replies = []
-    if comment_ids:
-        result = await db.execute(
-            select(Comment)
-            .where(Comment.parent_id.in_(comment_ids))
-            .options(selectinload(Comment.user))
-            .order_by(Comment.created_at.asc())
-        )
-        replies = result.scalars().all()
-
-    # Group replies by parent_id
-    replies_by_parent = {}
-    for reply in replies:
-        if reply.parent_id not in replies_by_parent:
-            replies_by_parent[reply.parent_id] = []
-        replies_by_parent[reply.parent_id].append(reply)
+    replies_by_parent = await _get_reply_previews([comment.id for comment in comments], replies_limit, db)
+    all_replies = [reply for replies in replies_by_parent.values() for reply in replies]
+    authors = await _load_authors([*comments, *all_replies], db)
 
-    # Convert to Pydantic models - EXPLICIT VERSION (recommended)
-    comments_out = [
+    return [
         CommentOut(
-            id=comment.id,
-            content=comment.content,
-            user_id=comment.user_id,
-            post_id=comment.post_id,
-            reel_id=comment.reel_id,
-            parent_id=comment.parent_id,
-            created_at=comment.created_at,
-            user=UserOut.model_validate(comment.user.__dict__),
+            **_to_brief(comment, authors[comment.user_id]).model_dump(),
             replies=[
-                CommentBrief(
-                    id=reply.id,
-                    content=reply.content,
-                    user_id=reply.user_id,
-                    post_id=reply.post_id,
-                    reel_id=reply.reel_id,
-                    parent_id=reply.parent_id,
-                    created_at=reply.created_at,
-                    user=UserOut.model_validate(reply.user.__dict__)
-                )
+                _to_brief(reply, authors[reply.user_id])
                 for reply in replies_by_parent.get(comment.id, [])
+                if reply.user_id in authors
             ]
         )
         for comment in comments
+        if comment.user_id in authors
     ]
 
-    return comments_out
 
-
-async def get_comment_replies(comment_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None):
-    """Get all replies to a specific comment with pagination."""
+async def _get_replies(
+        comment_id: int,
+        skip: int,
+        limit: int,
+        db: AsyncSession,
+        after_id: Optional[int]
+) -> dict:
     if db is None:
         raise ValueError("Database session is required")
 
-    # Get replies for the specific comment
-    result = await db.execute(
+    query = (
         select(Comment)
         .where(Comment.parent_id == comment_id)
-        .order_by(Comment.created_at.asc())
-        .offset(skip)
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
         .limit(limit)
     )
+    if after_id is not None:
+        query = query.where(_keyset_after(after_id))
+    elif skip:
+        query = query.offset(skip)
+    result = await db.execute(query)
     replies = result.scalars().all()
+    authors = await _load_authors(replies, db)
 
-    # Get total count
-    result = await db.execute(
-        select(func.count())
-        .where(Comment.parent_id == comment_id)
-    )
-    total_count = result.scalar()
+    # Total comes from the denormalized counter instead of a COUNT(*)
+    total_count = await db.scalar(select(Comment.reply_count).where(Comment.id == comment_id))
 
     return {
-        "replies": replies,
-        "total": total_count,
+        "replies": [_to_brief(reply, authors[reply.user_id]) for reply in replies if reply.user_id in authors],
+        "total": total_count or 0,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": replies[-1].id if len(replies) == limit else None
     }
 
 
-async def delete_comment(comment_id: int, user_id: int, db: AsyncSession = None):
-    """Delete a comment if it belongs to the user or if user_id is None (admin)."""
+async def get_comment_subtree(comment_id: int, limit: int = 200, db: AsyncSession = None) -> list[CommentNode]:
+    """
+    A comment and its descendants in depth-first order, oldest replies first,
+    read with a single range scan over the path index.
+    """
     if db is None:
         raise ValueError("Database session is required")
 
-    if user_id is None:
-        result = await db.execute(select(Comment).where(Comment.id == comment_id))
-    else:
-        result = await db.execute(select(Comment).where(Comment.id == comment_id, Comment.user_id == user_id))
+    root = await db.get(Comment, comment_id)
+    if root is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    result = await db.execute(
+        select(Comment)
+        .where(_subtree(root))
+        .order_by(Comment.path)
+        .limit(limit)
+    )
+    comments = result.scalars().all()
+    authors = await _load_authors(comments, db)
+
+    root_depth = (root.path or "").count("/")
+    return [
+        CommentNode(
+            **_to_brief(comment, authors[comment.user_id]).model_dump(),
+            depth=(comment.path or "").count("/") - root_depth
+        )
+        for comment in comments
+        if comment.user_id in authors
+    ]
+
+
+async def _delete_comment(comment_id: int, user_id: Optional[int], db: AsyncSession, target: Optional[str] = None):
+    """
+    Delete a comment and its whole reply subtree if it belongs to the user
+    or if user_id is None (admin).
+    """
+    if db is None:
+        raise ValueError("Database session is required")
+
+    query = select(Comment).where(Comment.id == comment_id)
+    if user_id is not None:
+        query = query.where(Comment.user_id == user_id)
+    if target is not None:
+        query = query.where(TARGETS[target][1].isnot(None))
+    result = await db.execute(query)
     comment = result.scalars().first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found or you don't have permission to delete it")
 
-    # Decrement comment_count on the post if it's a top-level comment
+    counted_target = None
     if comment.parent_id is None:
+        kind = "post" if comment.post_id is not None else "reel"
+        model = TARGETS[kind][0]
+        counted_target = (kind, comment.post_id if comment.post_id is not None else comment.reel_id)
+        await db.execute(
+            update(model)
+            .where(model.id == counted_target[1])
+            .values(comment_count=func.greatest(model.comment_count - 1, 0))
+        )
+    else:
         await db.execute(
-            update(Post)
-            .where(Post.id == comment.post_id)
-            .values(comment_count=Post.comment_count - 1)
+            update(Comment)
+            .where(Comment.id == comment.parent_id)
+            .values(reply_count=func.greatest(Comment.reply_count - 1, 0))
         )
+    subtree_ids = select(Comment.id).where(_subtree(comment))
     await db.execute(
-        delete(Notification).where(Notification.comment_id == comment_id)
+        delete(Notification).where(Notification.comment_id.in_(subtree_ids))
+    )
+    # One statement, so the self-referencing parent_id FK is satisfied at its end
+    await db.execute(
+        delete(Comment)
+        .where(_subtree(comment))
+        .execution_options(synchronize_session=False)
     )
-
-    await db.delete(comment)
     await db.commit()
+    if counted_target is not None:
+        kind, target_id = counted_target
+        await TARGET_CACHES[kind].invalidate(target_id)
     return {"message": "Comment deleted successfully"}
 
-async def create_reel_comment(reel_id: int, user_id: int, content: str, parent_id: int = None, db: AsyncSession = None):
-    if db is None:
-        raise ValueError("Database session is required")
-    result = await db.execute(select(Reel).where(Reel.id == reel_id))
-    reel = result.scalars().first()
-    if not reel:
-        raise HTTPException(status_code=404, detail="Reel not found")
-    if parent_id:
-        result = await db.execute(select(Comment).where(Comment.id == parent_id))
-        parent_comment = result.scalars().first()
-        if not parent_comment:
-            raise HTTPException(status_code=404, detail="Parent comment not found")
-    new_comment = Comment(content=content, user_id=user_id, reel_id=reel_id, parent_id=parent_id)
-    db.add(new_comment)
-    reel.comment_count = (reel.comment_count or 0) + 1
-    await db.commit()
-    await db.refresh(new_comment)
 
-    if reel.owner_id != user_id:
-        await create_notification(
-            user_id=reel.owner_id,
-            sender_id=user_id,
-            notification_type="comment",
-            reel_id=reel_id,
-            comment_id=new_comment.id,
-            db=db
-        )
+async def create_comment(post_id: int, user_id: int, content: str, parent_id: int = None, db: AsyncSession = None):
+    """Create a new comment or reply to a comment."""
+    return await _create_comment("post", post_id, user_id, content, parent_id, db)
+
+
+@coalesce
+async def get_comments_for_post(
+        post_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        db: AsyncSession = None,
+        before_id: Optional[int] = None,
+        replies_limit: int = 3
+):
+    """
+    Get a page of top-level comments for a post, newest first, each with a
+    preview of at most `replies_limit` replies.
+    Pass the id of the last comment as `before_id` to fetch the next page;
+    `skip` is only honoured when no cursor is given.
+    """
+    return await _get_thread("post", post_id, skip, limit, db, before_id, replies_limit)
+
+
+@coalesce
+async def get_comment_replies(
+        comment_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        db: AsyncSession = None,
+        after_id: Optional[int] = None
+):
+    """
+    Get a page of replies to a specific comment, oldest first.
+    Pass the returned `next_cursor` as `after_id` to fetch the next page.
+    """
+    return await _get_replies(comment_id, skip, limit, db, after_id)
+
 
-    return new_comment
+async def delete_comment(comment_id: int, user_id: int, db: AsyncSession = None):
+    """Delete a comment if it belongs to the user or if user_id is None (admin)."""
+    return await _delete_comment(comment_id, user_id, db)
+
+
+async def create_reel_comment(reel_id: int, user_id: int, content: str, parent_id: int = None, db: AsyncSession = None):
+    return await _create_comment("reel", reel_id, user_id, content, parent_id, db)
 
 
 async def reply_to_reel_comment(reel_id: int, parent_id: int, user_id: int, content: str, db: AsyncSession = None):
-    if db is None:
-        raise ValueError("Database session is required")
-    result = await db.execute(select(Reel).where(Reel.id == reel_id))
-    reel = result.scalars().first()
-    if not reel:
-        raise HTTPException(status_code=404, detail="Reel not found")
-    result = await db.execute(select(Comment).where(Comment.id == parent_id, Comment.reel_id == reel_id))
-    parent_comment = result.scalars().first()
-    if not parent_comment:
-        raise HTTPException(status_code=404, detail="Parent comment not found")
-    new_comment = Comment(content=content, user_id=user_id, reel_id=reel_id, parent_id=parent_id)
-    db.add(new_comment)
-    await db.commit()
-    await db.refresh(new_comment)
-        # Optionally, notify parent comment owner if it's a reply and not self
-    if parent_id and parent_comment.user_id != user_id:
-        await create_notification(
-            user_id=parent_comment.user_id,
-            sender_id=user_id,
-            notification_type="comment",
-            reel_id=reel_id,
-            comment_id=new_comment.id,
-            db=db
-        )
-    return new_comment
+    return await _create_comment("reel", reel_id, user_id, content, parent_id, db)
 
-async def get_comments_for_reel(reel_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None):
-    if db is None:
-        raise ValueError("Database session is required")
-    result = await db.execute(
-        select(Comment)
-        .where(Comment.reel_id == reel_id, Comment.parent_id == None)
-        .order_by(Comment.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    comments = result.scalars().all()
-    comment_ids = [comment.id for comment in comments]
-    replies = []
-    if comment_ids:
-        result = await db.execute(
-            select(Comment)
-            .where(Comment.parent_id.in_(comment_ids))
-            .order_by(Comment.created_at.asc())
-        )
-        replies = result.scalars().all()
-    replies_by_parent = {}
-    for reply in replies:
-        if reply.parent_id not in replies_by_parent:
-            replies_by_parent[reply.parent_id] = []
-        replies_by_parent[reply.parent_id].append(reply)
-    return {
-        "comments": comments,
-        "replies_by_parent": replies_by_parent
-    }
 
-async def get_reel_comment_replies(comment_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None):
-    if db is None:
-        raise ValueError("Database session is required")
-    result = await db.execute(
-        select(Comment)
-        .where(Comment.parent_id == comment_id)
-        .order_by(Comment.created_at.asc())
-        .offset(skip)
-        .limit(limit)
-    )
-    replies = result.scalars().all()
-    result = await db.execute(
-        select(func.count())
-        .where(Comment.parent_id == comment_id)
-    )
-    total_count = result.scalar()
-    return {
-        "replies": replies,
-        "total": total_count,
-        "skip": skip,
-        "limit": limit
-    }
+@coalesce
+async def get_comments_for_reel(
+        reel_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        db: AsyncSession = None,
+        before_id: Optional[int] = None,
+        replies_limit: int = 3
+):
+    return await _get_thread("reel", reel_id, skip, limit, db, before_id, replies_limit)
+
+
+@coalesce
+async def get_reel_comment_replies(
+        comment_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        db: AsyncSession = None,
+        after_id: Optional[int] = None
+):
+    return await _get_replies(comment_id, skip, limit, db, after_id)
+
 
 async def delete_reel_comment(comment_id: int, user_id: int, db: AsyncSession = None):
-    if db is None:
-        raise ValueError("Database session is required")
-    if user_id is None:
-        result = await db.execute(select(Comment).where(Comment.id == comment_id))
-    else:
-        result = await db.execute(select(Comment).where(Comment.id == comment_id, Comment.user_id == user_id))
-    comment = result.scalars().first()
-    if not comment or not comment.reel_id:
-        raise HTTPException(status_code=404, detail="Comment not found or you don't have permission to delete it")
-    # Decrement comment_count on the reel if it's a top-level comment
-    if comment.parent_id is None:
-        result = await db.execute(select(Reel).where(Reel.id == comment.reel_id))
-        reel = result.scalars().first()
-        if reel:
-            reel.comment_count = max((reel.comment_count or 1) - 1, 0)
-    await db.execute(delete(Notification).where(Notification.comment_id == comment_id))
-    await db.delete(comment)
-    await db.commit()
-    return {"message": "Comment deleted successfully"}
\ No newline at end of file
+    return await _delete_comment(comment_id, user_id, db, target="reel")
@@ -1,11 +1,16 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.models.follow import Follow
 from app.models.user import User
 from app.services.notification import create_notification
+from app.services.recommendation import discard_recommendation, mark_recommendations_dirty
+from app.services.graph import filter_following, on_follow, on_unfollow
+from app.services.story import invalidate_story_tray
 from app.schemas.user import UserOut
+from app.utils.singleflight import coalesce
 from sqlalchemy import func
 
 async def follow_user(follower_id: int, following_id: int, db: AsyncSession):
@@ -29,7 +34,15 @@ async def follow_user(follower_id: int, following_id: int, db: AsyncSession):
 
     new_follow = Follow(follower_id=follower_id, following_id=following_id)
     db.add(new_follow)
-    await db.commit()
+    await discard_recommendation(follower_id, following_id, db)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created the same follow (uq_follows_follower_following)
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Already following this user")
+    on_follow(follower_id, following_id)
+    invalidate_story_tray(follower_id)
 
     await create_notification(
         user_id=following_id,
@@ -52,9 +65,58 @@ async def unfollow_user(follower_id: int, following_id: int, db: AsyncSession):
         raise HTTPException(status_code=404, detail="Follow relationship not found")
 
     await db.delete(follow)
+    await mark_recommendations_dirty(follower_id, db)
     await db.commit()
+    on_unfollow(follower_id, following_id)
+    invalidate_story_tray(follower_id)
     return {"message": f"Unfollowed user {following_id}"}
 
+@coalesce
+async def get_follow_counts(user_id: int, db: AsyncSession) -> tuple:
+    """(followers_count, following_count) of a user"""
+    result = await db.execute(
+        select(
+            select(func.count()).select_from(Follow).where(Follow.following_id == user_id).scalar_subquery(),
+            select(func.count()).select_from(Follow).where(Follow.follower_id == user_id).scalar_subquery()
+        )
+    )
+    return tuple(result.one())
+
+async def _follow_counts(user_ids, db: AsyncSession):
+    """user_id -> (followers_count, following_count), two grouped queries for the whole list"""
+    followers = await db.execute(
+        select(Follow.following_id, func.count())
+        .where(Follow.following_id.in_(user_ids))
+        .group_by(Follow.following_id)
+    )
+    following = await db.execute(
+        select(Follow.follower_id, func.count())
+        .where(Follow.follower_id.in_(user_ids))
+        .group_by(Follow.follower_id)
+    )
+    followers_by_id = dict(followers.all())
+    following_by_id = dict(following.all())
+    return {
+        user_id: (followers_by_id.get(user_id, 0), following_by_id.get(user_id, 0))
+        for user_id in user_ids
+    }
+
+async def _build_user_list(users, current_user_id: int, db: AsyncSession):
+    if not users:
+        return []
+    user_ids = [user.id for user in users]
+    followed_ids = set()
+    if current_user_id:
+        followed_ids = await filter_following(current_user_id, user_ids, db)
+    counts = await _follow_counts(user_ids, db)
+    user_out_list = []
+    for user in users:
+        user_out = UserOut.model_validate(user)
+        user_out.followers_count, user_out.following_count = counts[user.id]
+        user_out.is_followed_by_current_user = user.id in followed_ids
+        user_out_list.append(user_out)
+    return user_out_list
+
 async def get_followers(user_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None, current_user_id: int = None):
     result = await db.execute(
         select(User).join(Follow, Follow.follower_id == User.id)
@@ -62,19 +124,7 @@ async def get_followers(user_id: int, skip: int = 0, limit: int = 10, db: AsyncS
         .offset(skip).limit(limit)
     )
     users = result.scalars().all()
-    user_out_list = []
-    for user in users:
-        followers_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.following_id == user.id))
-        following_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.follower_id == user.id))
-        is_followed = False
-        if current_user_id:
-            is_followed = await db.scalar(select(Follow).where(Follow.follower_id == current_user_id, Follow.following_id == user.id))
-        user_dict = user.model_dump() if hasattr(user, 'model_dump') else dict(user)
-        user_dict["followers_count"] = followers_count
-        user_dict["following_count"] = following_count
-        user_dict["is_followed_by_current_user"] = bool(is_followed)
-        user_out_list.append(UserOut(**user_dict))
-    return user_out_list
+    return await _build_user_list(users, current_user_id, db)
 
 async def get_following(user_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None, current_user_id: int = None):
     result = await db.execute(
@@ -83,16 +133,4 @@ async def get_following(user_id: int, skip: int = 0, limit: int = 10, db: AsyncS
         .offset(skip).limit(limit)
     )
     users = result.scalars().all()
-    user_out_list = []
-    for user in users:
-        followers_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.following_id == user.id))
-        following_count = await db.scalar(select(func.count()).select_from(Follow).where(Follow.follower_id == user.id))
-        is_followed = False
-        if current_user_id:
-            is_followed = await db.scalar(select(Follow).where(Follow.follower_id == current_user_id, Follow.following_id == user.id))
-        user_dict = user.model_dump() if hasattr(user, 'model_dump') else dict(user)
-        user_dict["followers_count"] = followers_count
-        user_dict["following_count"] = following_count
-        user_dict["is_followed_by_current_user"] = bool(is_followed)
-        user_out_list.append(UserOut(**user_dict))
-    return user_out_list
\ No newline at end of file
+    return await _build_user_list(users, current_user_id, db)
\ No newline at end of file
@@ -0,0 +1,71 @@
+from array import array
+from bisect import bisect_left, insort
+from typing import Iterable, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.follow import Follow
+from app.utils.cache import TTLCache
+
+# follower_id -> sorted array of followed user ids.
+# Entries expire after GRAPH_CACHE_TTL_SECONDS so follows handled by other
+# worker processes become visible without cross-process invalidation.
+_following_cache = TTLCache(maxsize=settings.GRAPH_CACHE_SIZE, ttl=settings.GRAPH_CACHE_TTL_SECONDS)
+
+
+def _contains(ids: array, user_id: int) -> bool:
+    index = bisect_left(ids, user_id)
+    return index < len(ids) and ids[index] == user_id
+
+
+async def following_ids(user_id: int, db: AsyncSession) -> array:
+    """
+    Sorted ids of the accounts `user_id` follows
+    """
+    ids = _following_cache.get(user_id)
+    if ids is None:
+        result = await db.execute(
+            select(Follow.following_id)
+            .where(Follow.follower_id == user_id)
+            .order_by(Follow.following_id)
+        )
+        ids = array("q", result.scalars().all())
+        _following_cache.set(user_id, ids)
+    return ids
+
+
+async def is_following(follower_id: int, following_id: int, db: AsyncSession) -> bool:
+    return _contains(await following_ids(follower_id, db), following_id)
+
+
+async def filter_following(user_id: int, candidate_ids: Iterable[int], db: AsyncSession) -> Set[int]:
+    """
+    The subset of `candidate_ids` that `user_id` follows
+    """
+    ids = await following_ids(user_id, db)
+    return {candidate_id for candidate_id in candidate_ids if _contains(ids, candidate_id)}
+
+
+async def following_filter(column, user_id: int, db: AsyncSession):
+    """
+    SQL criterion restricting `column` to accounts `user_id` follows.
+    Small sets are inlined as literal ids; very large ones fall back to a subquery.
+    """
+    ids = await following_ids(user_id, db)
+    if len(ids) <= settings.GRAPH_INLINE_LIMIT:
+        return column.in_(ids.tolist())
+    return column.in_(select(Follow.following_id).where(Follow.follower_id == user_id))
+
+
+def on_follow(follower_id: int, following_id: int) -> None:
+    ids = _following_cache.get(follower_id)
+    if ids is not None and not _contains(ids, following_id):
+        insort(ids, following_id)
+
+
+def on_unfollow(follower_id: int, following_id: int) -> None:
+    ids = _following_cache.get(follower_id)
+    if ids is not None and _contains(ids, following_id):
+        ids.pop(bisect_left(ids, following_id))
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, delete, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.hashtag import Hashtag, HashtagLink, Mention
+from app.models.like import Like
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.post import PostOut
+from app.services.notification import create_notification
+from app.utils.text_parsing import extract_hashtags, extract_mentions, normalize_hashtag
+
+
+async def index_caption(
+        author_id: int,
+        caption: Optional[str],
+        db: AsyncSession,
+        post_id: Optional[int] = None,
+        reel_id: Optional[int] = None
+) -> None:
+    """
+    Sync the hashtag links of a post or reel with its caption and record
+    new mentions. Links of tags the caption still has are kept, with their
+    created_at, so editing a caption does not count its tags as new uses.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    if (post_id is None) == (reel_id is None):
+        raise ValueError("Exactly one of post_id or reel_id is required")
+    target = HashtagLink.post_id == post_id if post_id is not None else HashtagLink.reel_id == reel_id
+
+    tags = extract_hashtags(caption)
+    result = await db.execute(
+        select(HashtagLink.id, Hashtag.name)
+        .join(Hashtag, Hashtag.id == HashtagLink.hashtag_id)
+        .where(target)
+    )
+    linked, stale_ids = set(), []
+    for link_id, name in result.all():
+        if name in tags and name not in linked:
+            linked.add(name)
+        else:
+            stale_ids.append(link_id)
+    if stale_ids:
+        await db.execute(delete(HashtagLink).where(HashtagLink.id.in_(stale_ids)))
+
+    new_tags = [tag for tag in tags if tag not in linked]
+    if new_tags:
+        # Upsert all tags in one statement; DO UPDATE makes RETURNING yield existing rows too
+        upsert = insert(Hashtag).values([{"name": tag} for tag in new_tags])
+        result = await db.execute(
+            upsert.on_conflict_do_update(index_elements=["name"], set_={"name": upsert.excluded.name})
+            .returning(Hashtag.id)
+        )
+        db.add_all([
+            HashtagLink(hashtag_id=hashtag_id, post_id=post_id, reel_id=reel_id)
+            for hashtag_id in result.scalars().all()
+        ])
+
+    usernames = extract_mentions(caption)
+    if not usernames:
+        return
+
+    mention_target = Mention.post_id == post_id if post_id is not None else Mention.reel_id == reel_id
+    result = await db.execute(select(Mention.user_id).where(mention_target))
+    already_mentioned = set(result.scalars().all())
+
+    result = await db.execute(
+        select(User.id).where(
+            User.username.in_(usernames),
+            User.is_active == True,
+            User.id != author_id
+        )
+    )
+    new_user_ids = [user_id for user_id in result.scalars().all() if user_id not in already_mentioned]
+
+    for user_id in new_user_ids:
+        db.add(Mention(user_id=user_id, sender_id=author_id, post_id=post_id, reel_id=reel_id))
+        await create_notification(
+            user_id=user_id,
+            sender_id=author_id,
+            notification_type="mention",
+            post_id=post_id,
+            reel_id=reel_id,
+            db=db,
+            commit=False
+        )
+
+
+async def get_posts_by_hashtag(
+        tag: str,
+        current_user_id: int,
+        db: AsyncSession,
+        before_id: Optional[int] = None,
+        limit: int = 12
+) -> dict:
+    """
+    Keyset-paginated posts for a hashtag, newest first.
+    Pass the returned next_cursor as before_id to fetch the next page.
+    """
+    query = (
+        select(Post)
+        .join(HashtagLink, HashtagLink.post_id == Post.id)
+        .join(Hashtag, Hashtag.id == HashtagLink.hashtag_id)
+        .where(
+            Hashtag.name == normalize_hashtag(tag),
+            or_(Post.is_private == False, Post.owner_id == current_user_id)
+        )
+        .options(selectinload(Post.owner))
+        .order_by(Post.id.desc())
+        .limit(limit)
+    )
+    if before_id is not None:
+        query = query.where(Post.id < before_id)
+
+    result = await db.execute(query)
+    posts = result.scalars().all()
+
+    post_ids = [post.id for post in posts]
+    liked_ids = set()
+    if post_ids:
+        like_result = await db.execute(
+            select(Like.post_id).where(Like.post_id.in_(post_ids), Like.user_id == current_user_id)
+        )
+        liked_ids = set(like_result.scalars().all())
+
+    post_outs = []
+    for post in posts:
+        post_out = PostOut.model_validate(post, from_attributes=True)
+        post_out.is_liked_by_current_user = post.id in liked_ids
+        post_outs.append(post_out)
+
+    return {
+        "tag": normalize_hashtag(tag),
+        "posts": post_outs,
+        "next_cursor": post_ids[-1] if len(post_ids) == limit else None
+    }
+
+
+async def get_trending_hashtags(limit: int = 10, hours: int = 24, db: AsyncSession = None):
+    """
+    Most used hashtags over the last `hours` hours
+    """
+    since = datetime.utcnow() - timedelta(hours=hours)
+    uses = func.count(HashtagLink.id).label("uses")
+    result = await db.execute(
+        select(Hashtag.name, uses)
+        .join(HashtagLink, HashtagLink.hashtag_id == Hashtag.id)
+        .where(HashtagLink.created_at >= since)
+        .group_by(Hashtag.id, Hashtag.name)
+        .order_by(uses.desc())
+        .limit(limit)
+    )
+    return [{"name": name, "uses": count} for name, count in result.all()]
@@ -1,11 +1,13 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.exc import IntegrityError
 
 from app.models.like import Like
 from app.models.post import Post
 from app.services.notification import create_notification
 from app.models.reel import Reel
+from app.utils.entity_cache import post_cache, reel_cache
 
 async def like_post(post_id: int, user_id: int, db: AsyncSession):
     # Check if post exists
@@ -37,10 +39,17 @@ async def like_post(post_id: int, user_id: int, db: AsyncSession):
             sender_id=user_id,
             notification_type="like",
             post_id=post_id,
-            db=db
+            db=db,
+            commit=False
         )
 
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created the same like (uq_likes_post_user)
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Post already liked")
+    await post_cache.invalidate(post_id)
 
     return {"message": "Post liked successfully"}
 
@@ -64,6 +73,7 @@ async def unlike_post(post_id: int, user_id: int, db: AsyncSession):
         post.like_count = len(result.scalars().all())
 
     await db.commit()
+    await post_cache.invalidate(post_id)
 
     return {"message": "Post unliked successfully"}
 
@@ -86,9 +96,16 @@ async def like_reel(reel_id: int, user_id: int, db: AsyncSession):
             sender_id=user_id,
             notification_type="like",
             reel_id=reel_id,
-            db=db
+            db=db,
+            commit=False
         )
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created the same like (uq_likes_reel_user)
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Reel already liked")
+    await reel_cache.invalidate(reel_id)
     return {"message": "Reel liked successfully"}
 
 async def unlike_reel(reel_id: int, user_id: int, db: AsyncSession):
@@ -102,4 +119,5 @@ async def unlike_reel(reel_id: int, user_id: int, db: AsyncSession):
     if reel and reel.like_count:
         reel.like_count -= 1
     await db.commit()
+    await reel_cache.invalidate(reel_id)
     return {"message": "Reel unliked successfully"}
\ No newline at end of file
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import select, delete, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.media import MediaTombstone
+from app.models.post import Post
+from app.models.reel import Reel
+from app.models.story import Story
+from app.models.user import User
+from app.utils.file_upload import UPLOAD_PATH, delete_media_files, upload_url
+
+logger = logging.getLogger(__name__)
+
+# Every column that stores an uploaded file
+MEDIA_COLUMNS = [
+    Post.image_url,
+    Post.video_url,
+    Reel.video_url,
+    Story.media_url,
+    User.profile_picture,
+]
+# Keeps IN (...) lists and tombstone batches reasonably sized
+_SCAN_CHUNK_SIZE = 1000
+
+# Totals since process start, for monitoring
+media_gc_metrics = {
+    "files_swept": 0,
+    "tombstones_cleared": 0,
+    "delete_failures": 0,
+    "orphans_found": 0,
+    "last_sweep_seconds": 0.0,
+}
+
+
+def discard_media(db: AsyncSession, *media_urls: Optional[str]) -> None:
+    """
+    Schedule files for deletion. Runs inside the caller's transaction, so the
+    files are only removed if the rows that referenced them are really gone.
+    """
+    db.add_all([MediaTombstone(media_url=media_url) for media_url in media_urls if media_url])
+
+
+async def sweep_media_tombstones(db: AsyncSession, batch_size: int = None) -> int:
+    """
+    Scheduled job: delete the files of pending tombstones batch by batch,
+    off the event loop, then clear the tombstones. A tombstone whose file
+    could not be removed is kept for the next sweep. Safe to run from
+    several workers at once. Returns the number of tombstones cleared.
+    """
+    batch_size = batch_size or settings.MEDIA_GC_BATCH_SIZE
+    started = time.monotonic()
+    cleared = files_swept = failed = 0
+    last_id = 0
+
+    while True:
+        result = await db.execute(
+            select(MediaTombstone.id, MediaTombstone.media_url)
+            .where(MediaTombstone.id > last_id)
+            .order_by(MediaTombstone.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        # Removing a file that is already gone is a no-op, so a crash between
+        # the unlink and the commit only means the batch is retried
+        removed, errors = await delete_media_files(
+            [media_url for _, media_url in rows],
+            concurrency=settings.MEDIA_DELETE_CONCURRENCY
+        )
+        files_swept += removed
+        for media_url, error in errors.items():
+            logger.warning(f"Could not delete media file {media_url}, keeping its tombstone: {error!r}")
+        done = [row_id for row_id, media_url in rows if media_url not in errors]
+        failed += len(rows) - len(done)
+        if done:
+            await db.execute(delete(MediaTombstone).where(MediaTombstone.id.in_(done)))
+        await db.commit()
+        cleared += len(done)
+        if len(rows) < batch_size:
+            break
+
+    media_gc_metrics["files_swept"] += files_swept
+    media_gc_metrics["tombstones_cleared"] += cleared
+    media_gc_metrics["delete_failures"] += failed
+    media_gc_metrics["last_sweep_seconds"] = round(time.monotonic() - started, 3)
+    if cleared:
+        logger.info(f"Swept {files_swept} media files for {cleared} tombstones")
+    return cleared
+
+
+def _list_uploads(min_age_seconds: float) -> List[Path]:
+    """Files under the upload directory older than `min_age_seconds`"""
+    cutoff = time.time() - min_age_seconds
+    return [
+        path for path in UPLOAD_PATH.rglob("*")
+        if path.is_file() and path.stat().st_mtime < cutoff
+    ]
+
+
+async def _referenced(urls: List[str], db: AsyncSession) -> set:
+    """The subset of `urls` still referenced by a row or already tombstoned."""
+    # Older profile pictures were stored as relative system paths
+    candidates = urls + [url.lstrip("/") for url in urls]
+    result = await db.execute(
+        union_all(
+            *(select(column).where(column.in_(candidates)) for column in MEDIA_COLUMNS),
+            select(MediaTombstone.media_url).where(MediaTombstone.media_url.in_(candidates))
+        )
+    )
+    return {"/" + value.replace("\\", "/").lstrip("/") for value in result.scalars().all()}
+
+
+async def scan_orphan_media(db: AsyncSession) -> int:
+    """
+    Scheduled job: tombstone files in static/uploads that no row references.
+    Files younger than MEDIA_ORPHAN_GRACE_SECONDS are skipped, since an upload
+    is written to disk before its row is committed. Returns the orphan count.
+    """
+    paths = await asyncio.to_thread(_list_uploads, settings.MEDIA_ORPHAN_GRACE_SECONDS)
+    urls = [upload_url(path) for path in paths]
+
+    orphans = []
+    for start in range(0, len(urls), _SCAN_CHUNK_SIZE):
+        chunk = urls[start:start + _SCAN_CHUNK_SIZE]
+        referenced = await _referenced(chunk, db)
+        orphans.extend(url for url in chunk if url not in referenced)
+
+    if orphans:
+        discard_media(db, *orphans)
+        await db.commit()
+        logger.info(f"Found {len(orphans)} orphaned media files in {UPLOAD_PATH}")
+    media_gc_metrics["orphans_found"] += len(orphans)
+    return len(orphans)
@@ -1,17 +1,9 @@
-from app.models.comment import Comment
-from app.schemas.notification import NotificationOut
-from app.schemas.reel import ReelOut
-from app.schemas.comment import CommentOut, CommentBrief
-from app.schemas.user import UserOut
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func
-from sqlalchemy.orm import selectinload
 from typing import Optional
 from app.models.notification import Notification
-from app.models.post import Post
-from app.models.reel import Reel
-from app.schemas.post import PostOut
+from app.services.projection import select_notification_items, notification_item
 
 
 
@@ -22,9 +14,10 @@ async def create_notification(
     post_id: Optional[int] = None,
     reel_id: Optional[int] = None,
     comment_id: Optional[int] = None,
-    db: AsyncSession = None
+    db: AsyncSession = None,
+    commit: bool = True
 ):
-    valid_types = ['like', 'comment', 'follow']
+    valid_types = ['like', 'comment', 'follow', 'mention']
     if notification_type not in valid_types:
         raise HTTPException(status_code=400, detail="Invalid notification type")
 
@@ -38,82 +31,30 @@ async def create_notification(
     )
 
     db.add(new_notification)
-    await db.commit()
-    await db.refresh(new_notification)
+    # Callers batching several notifications into their own transaction
+    # pass commit=False and commit once at the end
+    if commit:
+        await db.commit()
+        await db.refresh(new_notification)
     return new_notification
 
 
 async def get_user_notifications(
     user_id: int, skip: int, limit: int, db: AsyncSession
-) -> list[NotificationOut]:
+) -> list[dict]:
+    """
+    A page of the user's notifications, newest first, as plain dicts for the
+    route's NotificationOut response model; one statement, no ORM objects.
+    """
     result = await db.execute(
-        select(Notification)
-        .options(
-            selectinload(Notification.sender),
-            selectinload(Notification.post).selectinload(Post.owner),
-            selectinload(Notification.reel).selectinload(Reel.owner),
-            selectinload(Notification.comment).selectinload(Comment.user)  # Matches SQLAlchemy
-        )
+        select_notification_items()
         .where(Notification.user_id == user_id)
         .order_by(Notification.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    notifications = result.scalars().all()
-
-    notifications_out = []
-    for notification in notifications:
-        comment_out = None
-        if notification.comment:
-            comment_out = CommentBrief.model_validate({
-                **notification.comment.__dict__,
-                "user": UserOut.model_validate(notification.comment.user.__dict__)
-            })
-        # Convert sender
-        sender_out = UserOut.model_validate(notification.sender.__dict__)
-
-        # Convert post with owner
-        post_out = None
-        if notification.post:
-            post_out = PostOut.model_validate({
-                **notification.post.__dict__,
-                "owner": UserOut.model_validate(notification.post.owner.__dict__)
-            })
-
-        # Convert reel with owner
-        reel_out = None
-        if notification.reel:
-            reel_out = ReelOut.model_validate({
-                **notification.reel.__dict__,
-                "owner": UserOut.model_validate(notification.reel.owner.__dict__)
-            })
-
-        # Convert comment with user
-        comment_out = None
-        if notification.comment:
-            comment_out = CommentOut.model_validate({
-                **notification.comment.__dict__,
-                "owner": UserOut.model_validate(notification.comment.user.__dict__)
-            })
-
-        notifications_out.append(NotificationOut(
-            id=notification.id,
-            user_id=notification.user_id,
-            sender_id=notification.sender_id,
-            notification_type=notification.notification_type,
-            is_read=notification.is_read,
-            created_at=notification.created_at,
-            sender=sender_out,
-            post=post_out,
-            reel=reel_out,
-            comment=comment_out,
-            post_id=notification.post_id,
-            reel_id=notification.reel_id,
-            comment_id=notification.comment_id
-        ))
+    return [notification_item(row) for row in result.all()]
 
-    return notifications_out
-    
 
 async def mark_notification_as_read(notification_id: int, user_id: int, db: AsyncSession = None):
     result = await db.execute(
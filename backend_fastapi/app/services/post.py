@@ -1,9 +1,10 @@
 import logging
 import os
 import uuid
-from typing import Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Tuple
 from fastapi import UploadFile, HTTPException, status
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from pathlib import Path
@@ -12,7 +13,10 @@ from app.models.post import Post
 from app.models.user import User
 from app.schemas.post import PostCreate, PostUpdate, PostOut
 from app.utils.file_upload import handle_file_upload, delete_file
-from app.models.like import Like
+from app.services.media_gc import discard_media
+from app.utils.entity_cache import post_cache
+from app.services.projection import select_post_items, post_items, liked_post_ids
+from app.services.hashtag import index_caption
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +48,8 @@ async def create_post(
         )
 
         db.add(db_post)
+        await db.flush()
+        await index_caption(user_id, db_post.caption, db, post_id=db_post.id)
         await db.commit()
         await db.refresh(db_post)
         return db_post
@@ -63,32 +69,20 @@ async def get_all_posts(
         skip: int = 0,
         limit: int = 10,
         include_private: bool = False
-) -> List[PostOut]:
-    query = (
-        select(Post)
+) -> List[dict]:
+    result = await db.execute(
+        select_post_items()
         .where(
             (Post.is_private == False) |
             ((Post.owner_id == current_user_id) if include_private else False)
         )
-        .options(selectinload(Post.owner))
         .order_by(Post.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    result = await db.execute(query)
-    posts = result.scalars().unique().all()
-    # Fetch all liked post IDs for current user
-    post_ids = [post.id for post in posts]
-    liked_ids = set()
-    if post_ids:
-        like_result = await db.execute(select(Like.post_id).where(Like.post_id.in_(post_ids), Like.user_id == current_user_id))
-        liked_ids = set(row[0] for row in like_result.all())
-    post_outs = []
-    for post in posts:
-        post_dict = PostOut.model_validate(post, from_attributes=True).dict()
-        post_dict["is_liked_by_current_user"] = post.id in liked_ids
-        post_outs.append(PostOut(**post_dict))
-    return post_outs
+    rows = result.all()
+    liked_ids = await liked_post_ids([row.id for row in rows], current_user_id, db)
+    return post_items(rows, liked_ids)
 
 
 async def get_posts_for_user(
@@ -97,12 +91,12 @@ async def get_posts_for_user(
         db: AsyncSession,
         skip: int = 0,
         limit: int = 10
-) -> List[PostOut]:
+) -> List[dict]:
     """
     Get posts for a specific user that the current user is allowed to see
     """
-    query = (
-        select(Post)
+    result = await db.execute(
+        select_post_items()
         .where(
             Post.owner_id == user_id,
             or_(
@@ -110,34 +104,114 @@ async def get_posts_for_user(
                 Post.owner_id == current_user_id
             )
         )
-        .options(
-            selectinload(Post.owner),
-            selectinload(Post.comments)
-        )
-        .order_by(Post.created_at.desc())
+        .order_by(Post.created_at.desc(), Post.id.desc())
         .offset(skip)
         .limit(limit)
     )
+    return post_items(result.all())
 
-    result = await db.execute(query)
-    posts = result.scalars().unique().all()
 
-    return [PostOut.model_validate(post, from_attributes=True) for post in posts]
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _grid_cursor(created_at: datetime, post_id: int) -> str:
+    if created_at.tzinfo is None:
+        # Drivers without timezone support hand back naive UTC
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    micros = (created_at - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{post_id}"
+
+
+def _parse_grid_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        micros, post_id = (int(part) for part in cursor.split("."))
+        # posts.id is a 32-bit integer column
+        if not 0 < post_id < 2 ** 31:
+            raise ValueError(post_id)
+        return _EPOCH + timedelta(microseconds=micros), post_id
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def get_profile_grid(
+        user_id: int,
+        current_user_id: int,
+        db: AsyncSession,
+        before: Optional[str] = None,
+        limit: int = 12
+) -> dict:
+    """
+    Keyset-paginated profile grid, newest first: one index range scan on
+    (owner_id, created_at, id) per page, thumbnails and counts only.
+    Pass the returned next_cursor as `before` to fetch the next page.
+    """
+    query = (
+        select(
+            Post.id, Post.image_url, Post.video_url, Post.is_private,
+            Post.like_count, Post.comment_count, Post.created_at
+        )
+        .where(
+            Post.owner_id == user_id,
+            or_(Post.is_private == False, Post.owner_id == current_user_id)
+        )
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        query = query.where(tuple_(Post.created_at, Post.id) < tuple_(*_parse_grid_cursor(before)))
+
+    rows = (await db.execute(query)).all()
+    return {
+        "posts": [
+            {
+                "id": row.id,
+                "thumbnail_url": row.image_url or row.video_url,
+                "is_video": row.image_url is None and row.video_url is not None,
+                "is_private": row.is_private,
+                "like_count": row.like_count,
+                "comment_count": row.comment_count,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ],
+        "next_cursor": _grid_cursor(rows[-1].created_at, rows[-1].id) if rows and len(rows) == limit else None,
+    }
 
 
 async def get_post_by_id_service(
         post_id: int,
-        db: AsyncSession
-) -> Optional[Post]:
+        db: AsyncSession,
+        version: Optional[tuple] = None
+) -> Optional[PostOut]:
     """
-    Get a single post by ID
+    Get a single post by ID, through the read-through entity cache. Pass the
+    get_post_version() marker the response is validated against, so the
+    cached body always matches it.
+    """
+    async def load():
+        result = await db.execute(
+            select(Post)
+            .where(Post.id == post_id)
+            .options(selectinload(Post.owner))
+        )
+        post = result.scalars().first()
+        return PostOut.model_validate(post).model_dump(mode="json") if post else None
+
+    data = await post_cache.get_or_load(post_id, load, version)
+    return PostOut.model_validate(data) if data is not None else None
+
+
+async def get_post_version(post_id: int, db: AsyncSession) -> Optional[tuple]:
+    """
+    Cheap version marker of a post as served by get_post_by_id_service,
+    owner included. None if the post does not exist.
     """
     result = await db.execute(
-        select(Post)
+        select(Post.updated_at, Post.like_count, Post.comment_count, User.updated_at)
+        .join(User, User.id == Post.owner_id)
         .where(Post.id == post_id)
-        .options(selectinload(Post.owner))
     )
-    return result.scalars().first()
+    return result.first()
 
 
 async def update_post(
@@ -156,8 +230,13 @@ async def update_post(
     db_post = result.scalars().first()
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found")
-    # ... update logic ...
+    update_data = post_data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_post, field, value)
+    if "caption" in update_data:
+        await index_caption(db_post.owner_id, db_post.caption, db, post_id=db_post.id)
     await db.commit()
+    await post_cache.invalidate(db_post.id)
     await db.refresh(db_post)
     # Eagerly load owner relationship
     result = await db.execute(
@@ -191,14 +270,12 @@ async def delete_post(
             detail="Not authorized to delete this post"
         )
 
-    # Delete associated files from desktop
-    if post.image_url:
-        await delete_file(post.image_url)
-    if post.video_url:
-        await delete_file(post.video_url)
+    # Files are removed by the media sweeper once the delete is committed
+    discard_media(db, post.image_url, post.video_url)
 
     # Delete post from database
     await db.delete(post)
     await db.commit()
+    await post_cache.invalidate(post_id)
 
     return {"message": "Post deleted successfully"}
\ No newline at end of file
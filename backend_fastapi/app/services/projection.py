@@ -0,0 +1,237 @@
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.reel import Reel
+from app.models.story import Story
+from app.models.user import User
+
+# Column projections for list endpoints. Rows carry only what the compact
+# list schemas need (PostListItem for post lists; ReelListItem and
+# StoryListItem for the admin reel and story lists; NotificationOut, with
+# its full nested users, for the notification list) and become plain
+# dicts, which the route's response model validates and serializes once;
+# no ORM objects or identity map entries are built. Public reel lists
+# still go through serialize_reels() and ReelOut.
+
+OWNER_SUMMARY_COLUMNS = (
+    User.username.label("owner_username"),
+    User.full_name.label("owner_full_name"),
+    User.profile_picture.label("owner_profile_picture"),
+)
+
+# What UserOut shows, without the password hash
+USER_OUT_COLUMNS = (
+    User.id, User.username, User.email, User.profile_picture, User.full_name,
+    User.bio, User.is_active, User.is_admin, User.created_at,
+)
+
+
+def owner_summary(row) -> dict:
+    return {
+        "id": row.owner_id,
+        "username": row.owner_username,
+        "full_name": row.owner_full_name,
+        "profile_picture": row.owner_profile_picture,
+    }
+
+
+def select_post_items() -> Select:
+    return (
+        select(
+            Post.id, Post.caption, Post.is_private, Post.image_url, Post.video_url,
+            Post.owner_id, Post.created_at, Post.like_count, Post.comment_count,
+            *OWNER_SUMMARY_COLUMNS
+        )
+        .join(User, User.id == Post.owner_id)
+    )
+
+
+def post_item(row, liked: Optional[bool] = None) -> dict:
+    return {
+        "id": row.id,
+        "caption": row.caption,
+        "is_private": row.is_private,
+        "image_url": row.image_url,
+        "video_url": row.video_url,
+        "owner_id": row.owner_id,
+        "created_at": row.created_at,
+        "like_count": row.like_count,
+        "comment_count": row.comment_count,
+        "owner": owner_summary(row),
+        "is_liked_by_current_user": liked,
+    }
+
+
+async def liked_post_ids(post_ids: Iterable[int], user_id: int, db: AsyncSession) -> Set[int]:
+    post_ids = list(post_ids)
+    if not post_ids:
+        return set()
+    result = await db.execute(
+        select(Like.post_id).where(Like.post_id.in_(post_ids), Like.user_id == user_id)
+    )
+    return set(result.scalars().all())
+
+
+def select_reel_items() -> Select:
+    return (
+        select(
+            Reel.id, Reel.caption, Reel.video_url, Reel.owner_id, Reel.created_at,
+            Reel.like_count, Reel.comment_count,
+            *OWNER_SUMMARY_COLUMNS
+        )
+        .join(User, User.id == Reel.owner_id)
+    )
+
+
+def reel_item(row) -> dict:
+    return {
+        "id": row.id,
+        "caption": row.caption,
+        "video_url": row.video_url,
+        "owner_id": row.owner_id,
+        "created_at": row.created_at,
+        "like_count": row.like_count,
+        "comment_count": row.comment_count,
+        "owner": owner_summary(row),
+    }
+
+
+def select_story_items() -> Select:
+    return (
+        select(
+            Story.id, Story.media_url, Story.owner_id, Story.created_at, Story.expires_at,
+            *OWNER_SUMMARY_COLUMNS
+        )
+        .join(User, User.id == Story.owner_id)
+    )
+
+
+def story_item(row) -> dict:
+    return {
+        "id": row.id,
+        "media_url": row.media_url,
+        "owner_id": row.owner_id,
+        "created_at": row.created_at,
+        "expires_at": row.expires_at,
+        "owner": owner_summary(row),
+    }
+
+
+def post_items(rows, liked_ids: Optional[Set[int]] = None) -> List[dict]:
+    """Rows of select_post_items() as dicts; liked_ids=None leaves the like flag unset"""
+    return [
+        post_item(row, None if liked_ids is None else row.id in liked_ids)
+        for row in rows
+    ]
+
+
+def _user_out_columns(user, prefix: str) -> tuple:
+    return tuple(getattr(user, column.key).label(f"{prefix}_{column.key}") for column in USER_OUT_COLUMNS)
+
+
+def _user_out(row, prefix: str) -> Optional[dict]:
+    if getattr(row, f"{prefix}_id") is None:
+        return None
+    return {column.key: getattr(row, f"{prefix}_{column.key}") for column in USER_OUT_COLUMNS}
+
+
+def select_notification_items() -> Select:
+    """
+    Notifications with their sender, post, reel and comment (each with its
+    author) in one statement; the targets are outer joined.
+    """
+    sender = aliased(User)
+    post_owner = aliased(User)
+    reel_owner = aliased(User)
+    comment_author = aliased(User)
+    return (
+        select(
+            Notification.id, Notification.notification_type, Notification.is_read,
+            Notification.user_id, Notification.sender_id, Notification.post_id,
+            Notification.reel_id, Notification.comment_id, Notification.created_at,
+            *_user_out_columns(sender, "sender"),
+            Post.caption.label("post_caption"), Post.is_private.label("post_is_private"),
+            Post.image_url.label("post_image_url"), Post.video_url.label("post_video_url"),
+            Post.owner_id.label("post_owner_id"), Post.created_at.label("post_created_at"),
+            Post.like_count.label("post_like_count"), Post.comment_count.label("post_comment_count"),
+            *_user_out_columns(post_owner, "post_owner"),
+            Reel.caption.label("reel_caption"), Reel.video_url.label("reel_video_url"),
+            Reel.owner_id.label("reel_owner_id"), Reel.created_at.label("reel_created_at"),
+            Reel.like_count.label("reel_like_count"), Reel.comment_count.label("reel_comment_count"),
+            *_user_out_columns(reel_owner, "reel_owner"),
+            Comment.content.label("comment_content"), Comment.user_id.label("comment_user_id"),
+            Comment.post_id.label("comment_post_id"), Comment.reel_id.label("comment_reel_id"),
+            Comment.parent_id.label("comment_parent_id"), Comment.created_at.label("comment_created_at"),
+            Comment.reply_count.label("comment_reply_count"),
+            *_user_out_columns(comment_author, "comment_author"),
+        )
+        .join(sender, sender.id == Notification.sender_id)
+        .outerjoin(Post, Post.id == Notification.post_id)
+        .outerjoin(post_owner, post_owner.id == Post.owner_id)
+        .outerjoin(Reel, Reel.id == Notification.reel_id)
+        .outerjoin(reel_owner, reel_owner.id == Reel.owner_id)
+        .outerjoin(Comment, Comment.id == Notification.comment_id)
+        .outerjoin(comment_author, comment_author.id == Comment.user_id)
+    )
+
+
+def notification_item(row) -> dict:
+    post = reel = comment = None
+    if row.post_owner_id is not None:
+        post = {
+            "id": row.post_id,
+            "caption": row.post_caption,
+            "is_private": row.post_is_private,
+            "image_url": row.post_image_url,
+            "video_url": row.post_video_url,
+            "owner_id": row.post_owner_id,
+            "created_at": row.post_created_at,
+            "like_count": row.post_like_count,
+            "comment_count": row.post_comment_count,
+            "owner": _user_out(row, "post_owner"),
+        }
+    if row.reel_owner_id is not None:
+        reel = {
+            "id": row.reel_id,
+            "caption": row.reel_caption,
+            "video_url": row.reel_video_url,
+            "owner_id": row.reel_owner_id,
+            "created_at": row.reel_created_at,
+            "like_count": row.reel_like_count,
+            "comment_count": row.reel_comment_count,
+            "owner": _user_out(row, "reel_owner"),
+        }
+    if row.comment_user_id is not None:
+        comment = {
+            "id": row.comment_id,
+            "content": row.comment_content,
+            "user_id": row.comment_user_id,
+            "post_id": row.comment_post_id,
+            "reel_id": row.comment_reel_id,
+            "parent_id": row.comment_parent_id,
+            "created_at": row.comment_created_at,
+            "reply_count": row.comment_reply_count,
+            "user": _user_out(row, "comment_author"),
+        }
+    return {
+        "id": row.id,
+        "notification_type": row.notification_type,
+        "is_read": row.is_read,
+        "user_id": row.user_id,
+        "sender_id": row.sender_id,
+        "post_id": row.post_id,
+        "reel_id": row.reel_id,
+        "comment_id": row.comment_id,
+        "created_at": row.created_at,
+        "sender": _user_out(row, "sender"),
+        "post": post,
+        "reel": reel,
+        "comment": comment,
+    }
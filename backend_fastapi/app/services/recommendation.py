@@ -0,0 +1,129 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import select, delete, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.follow import Follow
+from app.models.recommendation import UserRecommendation
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# user_id -> candidate ids, best first
+_recommendation_cache = TTLCache(
+    maxsize=settings.RECOMMENDATION_CACHE_SIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS
+)
+
+
+async def mark_recommendations_dirty(user_id: int, db: AsyncSession) -> None:
+    """
+    Flag a user's stored candidates for the next refresh by clearing their
+    computed_at. Kept in the database so whichever worker runs the job sees
+    it. Runs inside the caller's transaction.
+    """
+    await db.execute(
+        update(UserRecommendation)
+        .where(UserRecommendation.user_id == user_id)
+        .values(computed_at=None)
+    )
+    _recommendation_cache.delete(user_id)
+
+
+async def compute_recommendations(user_id: int, db: AsyncSession) -> List[int]:
+    """
+    Recompute and store the friends-of-friends candidates for one user,
+    scored by the number of followed accounts that follow them.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    following = select(Follow.following_id).where(Follow.follower_id == user_id).cte("following")
+    mutuals = func.count(Follow.follower_id).label("mutuals")
+    result = await db.execute(
+        select(Follow.following_id, mutuals)
+        .join(User, User.id == Follow.following_id)
+        .where(
+            Follow.follower_id.in_(select(following.c.following_id)),
+            Follow.following_id.notin_(select(following.c.following_id)),
+            Follow.following_id != user_id,
+            User.is_active == True
+        )
+        .group_by(Follow.following_id)
+        .order_by(mutuals.desc(), Follow.following_id)
+        .limit(settings.RECOMMENDATION_POOL_SIZE)
+    )
+    candidates = result.all()
+
+    await db.execute(delete(UserRecommendation).where(UserRecommendation.user_id == user_id))
+    db.add_all([
+        UserRecommendation(user_id=user_id, candidate_id=candidate_id, score=float(score))
+        for candidate_id, score in candidates
+    ])
+
+    candidate_ids = [candidate_id for candidate_id, _ in candidates]
+    _recommendation_cache.set(user_id, candidate_ids)
+    return candidate_ids
+
+
+async def refresh_recommendations(db: AsyncSession) -> None:
+    """
+    Scheduled job: recompute users whose follows changed, then a batch of
+    users whose stored candidates are older than RECOMMENDATION_MAX_AGE_HOURS
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.RECOMMENDATION_MAX_AGE_HOURS)
+    # Dirty users (computed_at cleared) have a NULL minimum and come first
+    oldest = func.min(UserRecommendation.computed_at)
+    result = await db.execute(
+        select(UserRecommendation.user_id)
+        .group_by(UserRecommendation.user_id)
+        .having((oldest == None) | (oldest < cutoff))
+        .order_by(oldest.asc().nulls_first())
+        .limit(settings.RECOMMENDATION_BATCH_SIZE)
+    )
+    user_ids = list(result.scalars().all())
+
+    for user_id in user_ids:
+        await compute_recommendations(user_id, db)
+    if user_ids:
+        await db.commit()
+        logger.info(f"Refreshed recommendations for {len(user_ids)} users")
+
+
+async def get_recommended_user_ids(user_id: int, db: AsyncSession) -> List[int]:
+    """
+    Stored candidates for a user, served from the TTL cache when possible.
+    Users without stored candidates get them computed on first request.
+    """
+    candidate_ids = _recommendation_cache.get(user_id)
+    if candidate_ids is not None:
+        return candidate_ids
+
+    result = await db.execute(
+        select(UserRecommendation.candidate_id)
+        .where(UserRecommendation.user_id == user_id)
+        .order_by(UserRecommendation.score.desc(), UserRecommendation.candidate_id)
+    )
+    candidate_ids = list(result.scalars().all())
+    if not candidate_ids:
+        candidate_ids = await compute_recommendations(user_id, db)
+        await db.commit()
+        return candidate_ids
+
+    _recommendation_cache.set(user_id, candidate_ids)
+    return candidate_ids
+
+
+async def discard_recommendation(user_id: int, candidate_id: int, db: AsyncSession) -> None:
+    """
+    Drop a candidate the user just followed. Runs inside the caller's transaction.
+    """
+    await db.execute(
+        delete(UserRecommendation).where(
+            UserRecommendation.user_id == user_id,
+            UserRecommendation.candidate_id == candidate_id
+        )
+    )
+    await mark_recommendations_dirty(user_id, db)
@@ -1,18 +1,22 @@
 import logging
-import os
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 from fastapi import UploadFile, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 
 from app.models.reel import Reel
+from app.models.like import Like
 from app.models.follow import Follow
+from app.models.user import User
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.schemas.reel import ReelOut
-from app.schemas.user import UserOut
+from app.services.hashtag import index_caption
+from app.services.graph import following_filter
+from app.services.media_gc import discard_media
+from app.utils.entity_cache import reel_cache
 
 # Configure your path where files will be saved
 UPLOAD_PATH = Path("static/uploads")
@@ -69,61 +73,88 @@ async def create_reel(
     )
 
     db.add(new_reel)
+    await db.flush()
+    await index_caption(user_id, caption, db, reel_id=new_reel.id)
     await db.commit()
     await db.refresh(new_reel)
     return new_reel
 
 
-async def get_user_reels(user_id: int, skip: int, limit: int, db: AsyncSession):
+async def serialize_reels(
+        reels: Iterable[Reel],
+        current_user_id: Optional[int],
+        db: AsyncSession
+) -> List[ReelOut]:
+    """
+    Build ReelOut for reels loaded with their owner, filling in
+    is_liked_by_current_user with one query for the whole list.
+    """
+    reels = list(reels)
+    liked_ids = set()
+    if current_user_id is not None and reels:
+        like_result = await db.execute(
+            select(Like.reel_id).where(
+                Like.reel_id.in_([reel.id for reel in reels]),
+                Like.user_id == current_user_id
+            )
+        )
+        liked_ids = set(like_result.scalars().all())
+
+    reel_outs = []
+    for reel in reels:
+        reel_out = ReelOut.model_validate(reel)
+        if current_user_id is not None:
+            reel_out.is_liked_by_current_user = reel.id in liked_ids
+        reel_outs.append(reel_out)
+    return reel_outs
+
+
+async def get_user_reels(user_id: int, skip: int, limit: int, db: AsyncSession, current_user_id: Optional[int] = None):
     result = await db.execute(
         select(Reel)
         .options(selectinload(Reel.owner))
         .filter(Reel.owner_id == user_id)
+        .order_by(Reel.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    reels = result.scalars().all()
-    reels_data = []
-    for reel in reels:
-        reel_data_dict = reel.__dict__.copy()
-        reel_data_dict.pop('owner', None) # Remove owner if it exists
-        reels_data.append(ReelOut(
-            **reel_data_dict,
-            owner=UserOut.orm_mode(reel.owner)
-        ))
-    return reels_data
+    return await serialize_reels(result.scalars().all(), current_user_id, db)
 
 
-async def get_following_reels(user_id: int, skip: int, limit: int, db: AsyncSession):
-    following_query = select(Follow.following_id).where(
-        Follow.follower_id == user_id
+async def get_user_reels_version(user_id: int, db: AsyncSession) -> tuple:
+    """Cheap version marker of a user's reels and of the user embedded in them"""
+    result = await db.execute(
+        select(
+            func.count(Reel.id),
+            func.max(Reel.updated_at),
+            select(User.updated_at).where(User.id == user_id).scalar_subquery()
+        )
+        .where(Reel.owner_id == user_id)
     )
+    return tuple(result.first())
+
+
+async def get_following_reels(user_id: int, skip: int, limit: int, db: AsyncSession):
     result = await db.execute(
         select(Reel)
         .options(selectinload(Reel.owner))
-        .where(Reel.owner_id.in_(following_query))
+        .where(await following_filter(Reel.owner_id, user_id, db))
         .order_by(Reel.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    reels = result.scalars().all()
-    reels_data = []
-    for reel in reels:
-        reel_data_dict = reel.__dict__.copy()
-        reel_data_dict.pop('owner', None)  # Remove owner if it exists
-        reels_data.append(ReelOut(
-            **reel_data_dict,
-            owner=UserOut.orm_mode(reel.owner)
-        ))
-    return reels_data
+    return await serialize_reels(result.scalars().all(), user_id, db)
 
 
-async def get_all_reels(skip, limit, db):
+async def get_all_reels(skip, limit, db, current_user_id: Optional[int] = None):
     result = await db.execute(
-        select(Reel).options(selectinload(Reel.owner)).offset(skip).limit(limit)
+        select(Reel)
+        .options(selectinload(Reel.owner))
+        .order_by(Reel.created_at.desc())
+        .offset(skip)
+        .limit(limit)
     )
-    reels = result.scalars().all()
-    return [ReelOut.model_validate(reel) for reel in reels]
+    return await serialize_reels(result.scalars().all(), current_user_id, db)
 
 async def update_reel(
     reel_id: int,
@@ -150,19 +181,17 @@ async def update_reel(
     # Update fields
     if hasattr(reel_update, "caption") and reel_update.caption is not None:
         reel.caption = reel_update.caption
+        await index_caption(reel.owner_id, reel.caption, db, reel_id=reel.id)
 
     # Handle video update
     if new_video and new_video.filename:
-        # Delete old video if exists
-        if reel.video_url and os.path.exists(reel.video_url):
-            try:
-                os.remove(reel.video_url)
-            except OSError as e:
-                logger.error(f"Failed to delete old reel video: {e}")
+        # The old video is removed by the media sweeper after the commit
+        discard_media(db, reel.video_url)
         # Save new video
         reel.video_url = await save_reel_video(new_video)
 
     await db.commit()
+    await reel_cache.invalidate(reel.id)
     await db.refresh(reel)
     return reel
 
@@ -190,19 +219,46 @@ async def delete_reel(
             detail="Reel not found or not permitted to delete"
         )
 
-    # Delete the video file
-    if reel.video_url and os.path.exists(reel.video_url):
-        try:
-            os.remove(reel.video_url)
-        except OSError as e:
-            logger.error(f"Failed to delete reel video: {e}")
+    # The video is removed by the media sweeper after the commit
+    discard_media(db, reel.video_url)
 
     # Delete the database record
     await db.delete(reel)
     await db.commit()
+    await reel_cache.invalidate(reel_id)
 
     return {"detail": "Reel deleted successfully"}
 
 
-async def get_reel_by_id_service(reel_id: int, db: AsyncSession):
-    return await db.get(Reel, reel_id)
\ No newline at end of file
+async def get_reel_by_id_service(
+        reel_id: int,
+        db: AsyncSession,
+        version: Optional[tuple] = None
+) -> Optional[ReelOut]:
+    """
+    Get a single reel by ID, through the read-through entity cache. Pass the
+    get_reel_version() marker so the per-process tier can be used with
+    several workers.
+    """
+    async def load():
+        result = await db.execute(
+            select(Reel).options(selectinload(Reel.owner)).where(Reel.id == reel_id)
+        )
+        reel = result.scalars().first()
+        return ReelOut.model_validate(reel).model_dump(mode="json") if reel else None
+
+    data = await reel_cache.get_or_load(reel_id, load, version)
+    return ReelOut.model_validate(data) if data is not None else None
+
+
+async def get_reel_version(reel_id: int, db: AsyncSession) -> Optional[tuple]:
+    """
+    Cheap version marker of a reel as served by get_reel_by_id_service,
+    owner included. None if the reel does not exist.
+    """
+    result = await db.execute(
+        select(Reel.updated_at, Reel.like_count, Reel.comment_count, User.updated_at)
+        .join(User, User.id == Reel.owner_id)
+        .where(Reel.id == reel_id)
+    )
+    return result.first()
\ No newline at end of file
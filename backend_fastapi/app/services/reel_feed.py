@@ -0,0 +1,146 @@
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import select, func, or_, union_all, exists, literal, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.models.like import Like
+from app.models.post import Post
+from app.models.reel import Reel, ReelView
+from app.schemas.reel import ReelOut
+from app.services.reel import serialize_reels
+from app.services.graph import following_filter, filter_following
+from app.services.trending import get_trending_ids, hours_since
+from app.utils.cache import TTLCache
+
+# Blend of the three signals; affinity multiplies the sum
+VELOCITY_WEIGHT = 1.0
+RECENCY_WEIGHT = 0.6
+# Recency halves every RECENCY_HALF_LIFE_HOURS
+RECENCY_HALF_LIFE_HOURS = 12.0
+FOLLOWED_AFFINITY = 0.5
+COMMENT_WEIGHT = 2.0
+
+# user_id -> (skip the queue starts at, ranked reel ids best first)
+_feed_cache = TTLCache(maxsize=settings.REEL_FEED_CACHE_SIZE, ttl=settings.REEL_FEED_CACHE_TTL_SECONDS)
+
+
+def score(likes: int, comments: int, age_hours: float, interactions: int, followed: bool) -> float:
+    """
+    Engagement velocity plus recency, scaled by the viewer's affinity to the author
+    """
+    velocity = (likes + COMMENT_WEIGHT * comments) / (age_hours + 2)
+    recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    affinity = 1 + math.log1p(interactions) + (FOLLOWED_AFFINITY if followed else 0)
+    return (VELOCITY_WEIGHT * math.log1p(velocity) + RECENCY_WEIGHT * recency) * affinity
+
+
+async def _author_interactions(user_id: int, owner_ids: List[int], db: AsyncSession) -> Dict[int, int]:
+    """How many posts and reels of each author `user_id` has liked"""
+    liked_owners = union_all(
+        select(Reel.owner_id.label("owner_id"))
+        .join(Like, Like.reel_id == Reel.id)
+        .where(Like.user_id == user_id, Reel.owner_id.in_(owner_ids)),
+        select(Post.owner_id.label("owner_id"))
+        .join(Like, Like.post_id == Post.id)
+        .where(Like.user_id == user_id, Post.owner_id.in_(owner_ids))
+    ).subquery()
+    result = await db.execute(
+        select(liked_owners.c.owner_id, func.count())
+        .group_by(liked_owners.c.owner_id)
+    )
+    return dict(result.all())
+
+
+async def rank_reels(user_id: int, db: AsyncSession) -> List[int]:
+    """
+    Rank unseen candidate reels for a user: recent reels from followed
+    accounts plus the trending reels, scored in one pass over the batch.
+    """
+    trending_ids = await get_trending_ids("reel", 0, settings.TRENDING_SIZE, db) or []
+    since = datetime.utcnow() - timedelta(hours=settings.REEL_FEED_MAX_AGE_HOURS)
+    from_following = await following_filter(Reel.owner_id, user_id, db)
+
+    result = await db.execute(
+        select(Reel.id, Reel.owner_id, Reel.created_at, Reel.like_count, Reel.comment_count)
+        .where(
+            or_(Reel.id.in_(trending_ids), from_following & (Reel.created_at >= since)),
+            Reel.owner_id != user_id,
+            ~exists().where(ReelView.reel_id == Reel.id, ReelView.viewer_id == user_id)
+        )
+        .order_by(Reel.created_at.desc())
+        .limit(settings.REEL_FEED_CANDIDATES)
+    )
+    candidates = result.all()
+    if not candidates:
+        return []
+
+    owner_ids = list({row.owner_id for row in candidates})
+    followed = await filter_following(user_id, owner_ids, db)
+    interactions = await _author_interactions(user_id, owner_ids, db)
+
+    now = datetime.utcnow()
+    scored = sorted(
+        (
+            (
+                score(
+                    row.like_count,
+                    row.comment_count,
+                    hours_since(row.created_at, now),
+                    interactions.get(row.owner_id, 0),
+                    row.owner_id in followed
+                ),
+                row.id
+            )
+            for row in candidates
+        ),
+        reverse=True
+    )
+    return [reel_id for _, reel_id in scored]
+
+
+async def get_reel_feed(user_id: int, skip: int, limit: int, db: AsyncSession) -> List[ReelOut]:
+    """
+    Page of the personalized reels feed. The first page (skip=0) re-ranks;
+    later pages are sliced from the queue cached for the user. When that
+    queue is gone (expired, or cached by another worker) the page starts
+    at the head of a fresh ranking, which already leaves out the reels the
+    user has seen; slicing it by skip would jump over unseen ones. The new
+    queue is anchored at that skip so the pages after it carry on from it.
+    """
+    cached = None if skip == 0 else _feed_cache.get(user_id)
+    if cached is None or cached[0] > skip:
+        cached = (skip, await rank_reels(user_id, db))
+        _feed_cache.set(user_id, cached)
+    start, ranked = cached
+
+    page_ids = ranked[skip - start:skip - start + limit]
+    if not page_ids:
+        return []
+    result = await db.execute(
+        select(Reel).options(selectinload(Reel.owner)).where(Reel.id.in_(page_ids))
+    )
+    reels = {reel.id: reel for reel in result.scalars().all()}
+    return await serialize_reels([reels[reel_id] for reel_id in page_ids if reel_id in reels], user_id, db)
+
+
+async def mark_reel_viewed(reel_id: int, viewer_id: int, db: AsyncSession) -> dict:
+    """Record that `viewer_id` watched a reel; repeated views are ignored"""
+    result = await db.execute(
+        insert(ReelView)
+        .from_select(
+            ["reel_id", "viewer_id"],
+            select(Reel.id, literal(viewer_id, Integer)).where(Reel.id == reel_id)
+        )
+        .on_conflict_do_nothing(constraint="uq_reel_views_viewer_reel")
+        .returning(ReelView.id)
+    )
+    if result.first() is None and await db.get(Reel, reel_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reel not found")
+    await db.commit()
+    return {"message": "Reel marked as viewed"}
@@ -4,6 +4,13 @@ from sqlalchemy.orm import selectinload
 from app.models.user import User
 from app.models.post import Post
 from app.models.follow import Follow
+from app.models.reel import Reel
+from app.services.trending import get_trending_ids
+from app.services.recommendation import get_recommended_user_ids
+from app.services.graph import filter_following, following_filter
+from app.services.reel import serialize_reels
+from app.services.projection import select_post_items, post_items
+from app.utils.singleflight import coalesce
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -23,42 +30,69 @@ async def search_users(query: str, skip: int = 0, limit: int = 10, db: AsyncSess
 
 async def search_posts(query: str, current_user_id: int, skip: int = 0, limit: int = 10, db: AsyncSession = None):
     posts = await db.execute(
-        select(Post)
-        .options(selectinload(Post.owner))
-        .join(User)
+        select_post_items()
         .where(
             Post.caption.ilike(f"%{query}%"),
             (Post.is_private == False) | (Post.owner_id == current_user_id) |
-            (Post.owner_id.in_(
-                select(Follow.following_id).where(Follow.follower_id == current_user_id)
-            ))
+            await following_filter(Post.owner_id, current_user_id, db)
         )
         .offset(skip).limit(limit)
     )
-    return posts.scalars().all()
+    return post_items(posts.all())
 
 async def get_trending_posts(skip: int = 0, limit: int = 10, db: AsyncSession = None):
+    post_ids = await get_trending_ids("post", skip, limit, db)
+    if post_ids is None:
+        # Nothing engaged with inside the trending window: fall back to the newest public posts
+        latest_posts = await db.execute(
+            select_post_items()
+            .where(Post.is_private == False)
+            .order_by(Post.created_at.desc())
+            .offset(skip).limit(limit)
+        )
+        return post_items(latest_posts.all())
+    if not post_ids:
+        # Past the end of the ranking
+        return []
     trending_posts = await db.execute(
-        select(Post)
-        .options(selectinload(Post.owner))
-        .order_by(Post.like_count.desc())
-        .offset(skip).limit(limit)
+        select_post_items()
+        .where(Post.id.in_(post_ids), Post.is_private == False)
+    )
+    rows_by_id = {row.id: row for row in trending_posts.all()}
+    return post_items(rows_by_id[post_id] for post_id in post_ids if post_id in rows_by_id)
+
+@coalesce
+async def get_trending_reels(skip: int = 0, limit: int = 10, db: AsyncSession = None, current_user_id: int = None):
+    reel_ids = await get_trending_ids("reel", skip, limit, db)
+    if reel_ids is None:
+        latest_reels = await db.execute(
+            select(Reel)
+            .options(selectinload(Reel.owner))
+            .order_by(Reel.created_at.desc())
+            .offset(skip).limit(limit)
+        )
+        return await serialize_reels(latest_reels.scalars().all(), current_user_id, db)
+    if not reel_ids:
+        return []
+    trending_reels = await db.execute(
+        select(Reel)
+        .options(selectinload(Reel.owner))
+        .where(Reel.id.in_(reel_ids))
+    )
+    reels_by_id = {reel.id: reel for reel in trending_reels.scalars().all()}
+    return await serialize_reels(
+        [reels_by_id[reel_id] for reel_id in reel_ids if reel_id in reels_by_id], current_user_id, db
     )
-    return trending_posts.scalars().all()
 
 async def get_recommended_users(current_user_id: int, skip: int = 0, limit: int = 5, db: AsyncSession = None):
-    subquery = select(Follow.following_id).where(Follow.follower_id == current_user_id)
+    candidate_ids = await get_recommended_user_ids(current_user_id, db)
+    # Stored candidates can lag behind follows made since they were computed
+    already_following = await filter_following(current_user_id, candidate_ids, db)
+    candidate_ids = [user_id for user_id in candidate_ids if user_id not in already_following][skip:skip + limit]
+    if not candidate_ids:
+        return []
     recommended = await db.execute(
-        select(User)
-        .join(Follow, Follow.following_id == User.id)
-        .where(
-            Follow.follower_id.in_(subquery),
-            User.id.notin_(subquery),
-            User.id != current_user_id,
-            User.is_active == True
-        )
-        .group_by(User.id)
-        .order_by(func.count(Follow.follower_id).desc())
-        .offset(skip).limit(limit)
+        select(User).where(User.id.in_(candidate_ids), User.is_active == True)
     )
-    return recommended.scalars().all()
\ No newline at end of file
+    users_by_id = {user.id: user for user in recommended.scalars().all()}
+    return [users_by_id[user_id] for user_id in candidate_ids if user_id in users_by_id]
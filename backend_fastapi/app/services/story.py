@@ -1,21 +1,32 @@
 import logging
-import os
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 from fastapi import UploadFile, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models.story import Story
-from app.models.follow import Follow
-from app.models.story import Story
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, and_, exists, literal, Integer
+from sqlalchemy.dialects.postgresql import insert
+from app.config import settings
+from app.models.story import Story, StoryView
+from app.models.user import User
+from app.schemas.story import StoryTrayItem
+from app.schemas.user import UserOut
+from app.services.graph import following_filter, following_ids
+from app.utils.cache import TTLCache
+from app.services.media_gc import discard_media
 
 # Configure your path where files will be saved
 UPLOAD_PATH = Path("static/uploads")
 UPLOAD_PATH.mkdir(parents=True, exist_ok=True)
 logger = logging.getLogger(__name__)
 
+# viewer_id -> (built_at, story tray), see get_story_tray
+_tray_cache = TTLCache(maxsize=settings.STORY_TRAY_CACHE_SIZE, ttl=settings.STORY_TRAY_CACHE_TTL_SECONDS)
+# owner_id -> when the author last posted or deleted a story. Cached trays
+# built before that are stale; older marks can't outlive any tray.
+_author_changed_at = TTLCache(maxsize=settings.STORY_TRAY_CACHE_SIZE, ttl=settings.STORY_TRAY_CACHE_TTL_SECONDS)
+
 
 async def save_story_file(file: UploadFile) -> str:
     try:
@@ -65,11 +76,29 @@ async def create_story(
     )
 
     db.add(new_story)
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(stories_count=func.coalesce(User.stories_count, 0) + 1, has_active_story=True)
+    )
     await db.commit()
     await db.refresh(new_story)
+    mark_author_stories_changed(user_id)
     return new_story
 
 
+def invalidate_story_tray(viewer_id: int) -> None:
+    _tray_cache.delete(viewer_id)
+
+
+def mark_author_stories_changed(owner_id: int) -> None:
+    """
+    Outdate the cached trays of everyone following `owner_id`. O(1): trays
+    compare their build time against their authors' marks when read.
+    """
+    _author_changed_at.set(owner_id, time.monotonic())
+
+
 async def get_user_stories(
         user_id: int,
         db: AsyncSession
@@ -81,7 +110,7 @@ async def get_user_stories(
         select(Story).where(
             Story.owner_id == user_id,
             Story.expires_at > datetime.utcnow()
-        )
+        ).order_by(Story.created_at)
     )
     return result.scalars().all()
 
@@ -93,19 +122,108 @@ async def get_following_stories(
     """
     Get all active stories from users that the current user follows
     """
-    # Get list of users that current user follows
-    following_query = select(Follow.following_id).where(
-        Follow.follower_id == current_user_id
-    )
-
     result = await db.execute(
         select(Story).where(
             Story.expires_at > datetime.utcnow(),
-            Story.owner_id.in_(following_query)
+            await following_filter(Story.owner_id, current_user_id, db)
         ).order_by(Story.created_at.desc())
     )
     return result.scalars().all()
 
+async def get_story_tray(
+        current_user_id: int,
+        db: AsyncSession
+) -> list[StoryTrayItem]:
+    """
+    One entry per followed author with active stories: unseen authors first,
+    then most recent first. Cached per viewer until a followed author posts,
+    the viewer watches a story or the earliest story in the tray expires.
+    """
+    followed = await following_ids(current_user_id, db)
+    cached = _tray_cache.get(current_user_id)
+    if cached is not None:
+        built_at, tray = cached
+        if not any(_author_changed_at.get(owner_id, 0) >= built_at for owner_id in followed):
+            return tray
+
+    built_at = time.monotonic()
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(
+            Story.owner_id,
+            func.count(Story.id),
+            func.max(Story.created_at),
+            func.min(Story.expires_at),
+            func.bool_or(StoryView.id == None)
+        )
+        .outerjoin(
+            StoryView,
+            and_(StoryView.story_id == Story.id, StoryView.viewer_id == current_user_id)
+        )
+        .where(
+            Story.expires_at > now,
+            await following_filter(Story.owner_id, current_user_id, db)
+        )
+        .group_by(Story.owner_id)
+    )
+    rows = result.all()
+
+    owners = {}
+    if rows:
+        owner_result = await db.execute(select(User).where(User.id.in_([row[0] for row in rows])))
+        owners = {user.id: UserOut.model_validate(user) for user in owner_result.scalars().all()}
+
+    tray = [
+        StoryTrayItem(
+            owner=owners[owner_id],
+            story_count=story_count,
+            latest_story_at=latest_story_at,
+            has_unseen=has_unseen
+        )
+        for owner_id, story_count, latest_story_at, _, has_unseen in rows
+        if owner_id in owners
+    ]
+    tray.sort(key=lambda item: (not item.has_unseen, -item.latest_story_at.timestamp()))
+
+    ttl = settings.STORY_TRAY_CACHE_TTL_SECONDS
+    if rows:
+        first_expiry = min(row[3] for row in rows)
+        ttl = max(min(ttl, (first_expiry - now).total_seconds()), 1)
+    _tray_cache.set(current_user_id, (built_at, tray), ttl=ttl)
+    return tray
+
+
+async def mark_story_viewed(
+        story_id: int,
+        viewer_id: int,
+        db: AsyncSession
+) -> dict:
+    """Record that `viewer_id` watched an active story; repeated views are ignored"""
+    result = await db.execute(
+        insert(StoryView)
+        .from_select(
+            ["story_id", "viewer_id"],
+            select(Story.id, literal(viewer_id, Integer))
+            .where(Story.id == story_id, Story.expires_at > datetime.utcnow())
+        )
+        .on_conflict_do_nothing(constraint="uq_story_views_story_viewer")
+        .returning(StoryView.id)
+    )
+    created = result.first() is not None
+    if not created and await db.scalar(
+        select(Story.id).where(Story.id == story_id, Story.expires_at > datetime.utcnow())
+    ) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Story not found or expired"
+        )
+    await db.commit()
+
+    if created:
+        invalidate_story_tray(viewer_id)
+    return {"message": "Story marked as viewed"}
+
+
 async def delete_story(
         story_id: int,
         user_id: int,
@@ -132,51 +250,100 @@ async def delete_story(
             detail="Story not found or not owned by user"
         )
 
-    # Delete the media file
-    if story.media_url and os.path.exists(story.media_url):
-        try:
-            os.remove(story.media_url)
-        except OSError as e:
-            logger.error(f"Failed to delete story file: {e}")
+    # The media file is removed by the media sweeper after the commit
+    discard_media(db, story.media_url)
 
     # Delete the database record
+    owner_id = story.owner_id
     await db.delete(story)
+    await db.flush()
+    await _sync_story_counters([owner_id], db)
     await db.commit()
+    mark_author_stories_changed(owner_id)
 
     return {"message": f"Story {story_id} deleted successfully"}
 
 
-async def cleanup_expired_stories(db: AsyncSession) -> int:
-    """
-    Clean up expired stories and their media files
-    Returns number of stories deleted
-    """
-    # Get all expired stories
-    result = await db.execute(
-        select(Story).where(
-            Story.expires_at <= datetime.utcnow()
+async def _sync_story_counters(owner_ids, db: AsyncSession) -> None:
+    """Recount active stories for the given users. Runs inside the caller's transaction."""
+    now = datetime.utcnow()
+    active = and_(Story.owner_id == User.id, Story.expires_at > now)
+    await db.execute(
+        update(User)
+        .where(User.id.in_(list(owner_ids)))
+        .values(
+            stories_count=select(func.count(Story.id)).where(active).scalar_subquery(),
+            has_active_story=exists().where(active)
         )
+        .execution_options(synchronize_session=False)
     )
-    expired_stories = result.scalars().all()
 
-    deleted_count = 0
 
-    for story in expired_stories:
-        # Delete the media file
-        if story.media_url and os.path.exists(story.media_url):
-            try:
-                os.remove(story.media_url)
-            except OSError as e:
-                logger.error(f"Failed to delete expired story file: {e}")
+# Totals since process start, for monitoring
+reaper_metrics = {
+    "runs": 0,
+    "stories_deleted": 0,
+    "files_discarded": 0,
+    "last_run_seconds": 0.0,
+}
 
-        # Delete the database record
-        await db.delete(story)
-        deleted_count += 1
 
-    if deleted_count > 0:
+async def reap_expired_stories(db: AsyncSession, batch_size: int = None) -> dict:
+    """
+    Delete expired stories in batches of `batch_size` with DELETE ... RETURNING,
+    recount the owners' active stories and tombstone their media files in the
+    same transaction; the media sweeper removes the files. Returns the
+    metrics of this run.
+    """
+    batch_size = batch_size or settings.STORY_REAPER_BATCH_SIZE
+    started = time.monotonic()
+    stories_deleted = files_discarded = batches = 0
+
+    while True:
+        batch = (
+            select(Story.id)
+            .where(Story.expires_at <= datetime.utcnow())
+            .order_by(Story.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        result = await db.execute(
+            delete(Story)
+            .where(Story.id.in_(select(batch.c.id)))
+            .returning(Story.owner_id, Story.media_url)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        if not rows:
+            break
+
+        await _sync_story_counters({owner_id for owner_id, _ in rows}, db)
+        discard_media(db, *(media_url for _, media_url in rows))
         await db.commit()
 
-    return deleted_count
+        files_discarded += sum(1 for _, media_url in rows if media_url)
+        stories_deleted += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    metrics = {
+        "stories_deleted": stories_deleted,
+        "files_discarded": files_discarded,
+        "batches": batches,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+    reaper_metrics["runs"] += 1
+    reaper_metrics["stories_deleted"] += stories_deleted
+    reaper_metrics["files_discarded"] += files_discarded
+    reaper_metrics["last_run_seconds"] = metrics["seconds"]
+    if stories_deleted:
+        logger.info(
+            f"Reaped {stories_deleted} expired stories ({files_discarded} files) "
+            f"in {batches} batches, {metrics['seconds']}s"
+        )
+    return metrics
 
 
 async def get_story_by_id_service(story_id: int, db: AsyncSession):
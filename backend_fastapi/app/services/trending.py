@@ -0,0 +1,111 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.post import Post
+from app.models.reel import Reel
+
+logger = logging.getLogger(__name__)
+
+# A comment is a stronger engagement signal than a like
+COMMENT_WEIGHT = 2.0
+# Hacker News style gravity: higher values sink older content faster
+GRAVITY = 1.5
+
+# Precomputed rankings (best first), rebuilt by refresh_trending() in every
+# worker process
+_rankings: Dict[str, List[int]] = {"post": [], "reel": []}
+_computed_at: Optional[float] = None
+_refresh_lock = asyncio.Lock()
+
+
+def hours_since(created_at: Optional[datetime], now: datetime) -> float:
+    if created_at is None:
+        return 0.0
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return max((now - created_at).total_seconds() / 3600, 0.0)
+
+
+def score(likes: int, comments: int, age_hours: float) -> float:
+    """
+    Time-decayed engagement score for recent likes and comments
+    """
+    return (likes + COMMENT_WEIGHT * comments) / ((age_hours + 2) ** GRAVITY)
+
+
+async def _rank(model, like_column, comment_column, since: datetime, db: AsyncSession, *filters) -> List[int]:
+    likes = (
+        select(like_column.label("target_id"), func.count().label("n"))
+        .where(like_column.isnot(None), Like.created_at >= since)
+        .group_by(like_column)
+        .subquery()
+    )
+    comments = (
+        select(comment_column.label("target_id"), func.count().label("n"))
+        .where(comment_column.isnot(None), Comment.created_at >= since)
+        .group_by(comment_column)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            model.id,
+            model.created_at,
+            func.coalesce(likes.c.n, 0),
+            func.coalesce(comments.c.n, 0)
+        )
+        .outerjoin(likes, likes.c.target_id == model.id)
+        .outerjoin(comments, comments.c.target_id == model.id)
+        .where(or_(likes.c.n.isnot(None), comments.c.n.isnot(None)), *filters)
+    )
+    now = datetime.utcnow()
+    scored = (
+        (score(like_count, comment_count, hours_since(created_at, now)), target_id)
+        for target_id, created_at, like_count, comment_count in result.all()
+    )
+    return [target_id for _, target_id in heapq.nlargest(settings.TRENDING_SIZE, scored)]
+
+
+def _is_stale() -> bool:
+    stale_after = settings.TRENDING_REFRESH_SECONDS * 2
+    return _computed_at is None or time.monotonic() - _computed_at > stale_after
+
+
+async def refresh_trending(db: AsyncSession, only_if_stale: bool = False) -> None:
+    """
+    Recompute the post and reel rankings from engagement in the trending window.
+    With `only_if_stale`, callers that queued on the lock behind a refresh
+    reuse its result instead of recomputing in turn.
+    """
+    global _computed_at
+    async with _refresh_lock:
+        if only_if_stale and not _is_stale():
+            return
+        since = datetime.utcnow() - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+        _rankings["post"] = await _rank(Post, Like.post_id, Comment.post_id, since, db, Post.is_private == False)
+        _rankings["reel"] = await _rank(Reel, Like.reel_id, Comment.reel_id, since, db)
+        _computed_at = time.monotonic()
+    logger.info(f"Trending refreshed: {len(_rankings['post'])} posts, {len(_rankings['reel'])} reels")
+
+
+async def get_trending_ids(kind: str, skip: int, limit: int, db: AsyncSession) -> Optional[List[int]]:
+    """
+    Page of the precomputed ranking for "post" or "reel", or None when the
+    ranking is empty. Computes the ranking on demand if the background
+    refresh has not run yet or has stalled.
+    """
+    if _is_stale():
+        await refresh_trending(db, only_if_stale=True)
+    ranking = _rankings[kind]
+    if not ranking:
+        return None
+    return ranking[skip:skip + limit]
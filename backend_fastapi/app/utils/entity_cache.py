@@ -0,0 +1,138 @@
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from app.config import settings
+from app.utils import fast_json
+from app.utils.cache import TTLCache
+from app.utils.singleflight import SingleFlight
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # the shared tier is optional
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+_redis = None
+
+
+def _shared_tier():
+    """Redis client for the shared tier, or None when it is not configured"""
+    global _redis
+    if _redis is None and settings.REDIS_URL and redis_asyncio is not None:
+        _redis = redis_asyncio.from_url(settings.REDIS_URL)
+    return _redis
+
+
+class _Loads:
+    """Loads of one key in flight, and whether the key was invalidated meanwhile"""
+    __slots__ = ("running", "stale")
+
+    def __init__(self):
+        self.running = 0
+        self.stale = False
+
+
+class EntityCache:
+    """
+    Two-tier read-through cache for serialized entities (JSON-compatible
+    dicts): a per-process TTL/LRU in front of an optional shared Redis tier.
+    Concurrent misses for one key share a single load, and a load that
+    raced with an invalidation of its key is returned but not stored.
+
+    invalidate() only reaches this process and Redis, so unversioned reads
+    skip the per-process tier when several workers run. Callers that pass
+    a version marker read from the database (see get_post_version) can use
+    it either way: entries are stored under their version, so a change
+    made by any worker is a miss everywhere.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = None, ttl: float = None):
+        self.namespace = namespace
+        self.ttl = ttl or settings.ENTITY_CACHE_TTL_SECONDS
+        self._local = TTLCache(maxsize=maxsize or settings.ENTITY_CACHE_SIZE, ttl=self.ttl)
+        self._local_unversioned = settings.WEB_WORKERS == 1
+        self._flight = SingleFlight(f"entity_cache.{namespace}")
+        self._loads: Dict[Hashable, _Loads] = {}
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"entity:{self.namespace}:{key}"
+
+    async def get_or_load(
+            self,
+            key: Hashable,
+            loader: Callable[[], Awaitable[Optional[dict]]],
+            version: Optional[tuple] = None
+    ) -> Optional[dict]:
+        use_local = self._local_unversioned
+        if version is not None:
+            digest = hashlib.sha1("|".join(str(part) for part in version).encode()).hexdigest()[:20]
+            key = f"{key}@{digest}"
+            use_local = True
+        if use_local:
+            value = self._local.get(key)
+            if value is not None:
+                return value
+        return await self._flight.do(key, lambda: self._load(key, loader, use_local))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[dict]]], use_local: bool) -> Optional[dict]:
+        loads = self._loads.setdefault(key, _Loads())
+        loads.running += 1
+        try:
+            value = await self._shared_get(key)
+            if value is None:
+                value = await loader()
+                if value is None:
+                    return None
+                if not loads.stale:
+                    await self._shared_set(key, value)
+            if use_local and not loads.stale:
+                self._local.set(key, value)
+            return value
+        finally:
+            loads.running -= 1
+            if not loads.running and self._loads.get(key) is loads:
+                del self._loads[key]
+
+    async def invalidate(self, *keys: Hashable) -> None:
+        for key in keys:
+            # Loads already running keep their result out of the cache; the
+            # next one starts with a clean slate
+            loads = self._loads.pop(key, None)
+            if loads is not None:
+                loads.stale = True
+            self._local.delete(key)
+            self._flight.forget(key)
+        client = _shared_tier()
+        if client is not None and keys:
+            try:
+                await client.delete(*(self._shared_key(key) for key in keys))
+            except Exception:
+                logger.exception(f"Shared cache invalidation failed for {self.namespace}")
+
+    async def _shared_get(self, key: Hashable) -> Optional[dict]:
+        client = _shared_tier()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self._shared_key(key))
+        except Exception:
+            logger.exception(f"Shared cache read failed for {self.namespace}")
+            return None
+        return fast_json.loads(raw) if raw is not None else None
+
+    async def _shared_set(self, key: Hashable, value: dict) -> None:
+        client = _shared_tier()
+        if client is None:
+            return
+        try:
+            await client.set(self._shared_key(key), fast_json.dumps(value), ex=int(self.ttl))
+        except Exception:
+            logger.exception(f"Shared cache write failed for {self.namespace}")
+
+
+# One cache per entity kind
+post_cache = EntityCache("post")
+reel_cache = EntityCache("reel")
+user_cache = EntityCache("user")
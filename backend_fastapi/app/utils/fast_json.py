@@ -0,0 +1,33 @@
+"""
+JSON encoding through orjson when it is installed, the stdlib otherwise.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Response class for routes without a response model, which FastAPI would
+    otherwise render with the stdlib encoder. Routes with a response model
+    are serialized by pydantic-core already and should keep the default.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
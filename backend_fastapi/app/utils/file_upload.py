@@ -1,12 +1,13 @@
-import os
+import asyncio
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from fastapi import UploadFile, HTTPException, status
 
 # Configure your upload path
 UPLOAD_PATH = Path("static/uploads")
 UPLOAD_PATH.mkdir(parents=True, exist_ok=True)
+UPLOAD_URL_PREFIX = "/static/uploads/"
 
 async def save_file(file: UploadFile, subfolder: str = "") -> str:
     """
@@ -62,12 +63,76 @@ async def handle_file_upload(
 
 async def delete_file(file_path: str) -> bool:
     """
-    Delete file from local storage if it exists
+    Delete an uploaded file right away. Only for files no row references yet
+    (e.g. a failed create); everything else goes through app.services.media_gc.
     """
+    path = media_path(file_path)
+    if path is None:
+        return False
     try:
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
-            return True
+        return await asyncio.to_thread(_remove, path)
+    except OSError:
         return False
-    except Exception as e:
-        return False
\ No newline at end of file
+
+def media_path(url: Optional[str]) -> Optional[Path]:
+    """
+    Map a stored media URL ("/static/uploads/...") to its file on disk.
+    Legacy rows holding the relative system path ("static/uploads/...") are
+    accepted too. Returns None for anything outside the upload directory.
+    """
+    if not url:
+        return None
+    url = url.replace("\\", "/")
+    if not url.startswith("/"):
+        url = "/" + url
+    if not url.startswith(UPLOAD_URL_PREFIX):
+        return None
+    root = UPLOAD_PATH.resolve()
+    path = (root / url[len(UPLOAD_URL_PREFIX):]).resolve()
+    if root not in path.parents:
+        return None
+    return path
+
+
+def upload_url(path: Path) -> str:
+    """Inverse of media_path: the URL a file under the upload directory is served at."""
+    return UPLOAD_URL_PREFIX + path.resolve().relative_to(UPLOAD_PATH.resolve()).as_posix()
+
+
+def _remove(path: Path) -> bool:
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+async def delete_media_files(
+        media_urls: Iterable[str],
+        concurrency: int = 16
+) -> Tuple[int, Dict[str, BaseException]]:
+    """
+    Delete the files behind `media_urls` in worker threads, at most
+    `concurrency` at a time. Returns the number of files removed and the
+    error for each URL whose file could not be removed; files that are
+    already gone count as done.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def remove(path: Path) -> bool:
+        async with semaphore:
+            return await asyncio.to_thread(_remove, path)
+
+    urls_by_path: Dict[Path, List[str]] = {}
+    for media_url in media_urls:
+        path = media_path(media_url)
+        if path is not None:
+            urls_by_path.setdefault(path, []).append(media_url)
+    results = await asyncio.gather(*(remove(path) for path in urls_by_path), return_exceptions=True)
+    failed = {
+        media_url: result
+        for urls, result in zip(urls_by_path.values(), results)
+        if isinstance(result, BaseException)
+        for media_url in urls
+    }
+    return sum(1 for result in results if result is True), failed
@@ -0,0 +1,128 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Cache-Control presets for read endpoints
+NO_CACHE = "no-cache"
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def public(max_age: int) -> str:
+    return f"public, max-age={max_age}"
+
+
+def weak_etag(*parts) -> str:
+    """Weak validator built from version markers (ids, timestamps, counters...)"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def cache_control(value: str):
+    """Dependency setting the Cache-Control header of a route's response"""
+    def set_cache_control(response: Response):
+        response.headers["Cache-Control"] = value
+    return set_cache_control
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Attach `etag` to the response. Returns a ready 304 response when the
+    client already has it, so the route can skip loading and serializing.
+    """
+    response.headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers = {"ETag": etag}
+        if "cache-control" in response.headers:
+            headers["Cache-Control"] = response.headers["cache-control"]
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+class ETagMiddleware:
+    """
+    Fallback validator for JSON GET responses that did not set their own
+    ETag: hashes the body into a weak ETag and turns matching requests into
+    304s. Saves the transfer but not the work; routes with a cheap version
+    marker should call not_modified() instead.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int = 1024 * 1024, exclude_prefixes=("/static",)):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or scope["path"].startswith(self.exclude_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Optional[Message] = None
+        chunks = []
+        size = 0
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "etag" in headers
+                    or not headers.get("content-type", "").startswith("application/json")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.max_body_size:
+                # Too big to hold: stream the rest as is
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+            headers = MutableHeaders(scope=start)
+            headers["ETag"] = etag
+            if etag_matches(if_none_match, etag):
+                start["status"] = 304
+                del headers["content-length"]
+                del headers["content-type"]
+                body = b""
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
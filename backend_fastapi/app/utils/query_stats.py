@@ -0,0 +1,192 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """SQL statements run on behalf of one request (or one query_budget block)"""
+
+    __slots__ = ("queries", "db_seconds", "slowest_seconds", "slowest_statement", "pool_wait_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.pool_wait_seconds = 0.0
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# (method, route path) -> running totals, see route_metrics()
+_routes: Dict[Tuple[str, str], dict] = {}
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def install_query_listeners(sync_engine) -> None:
+    """Count and time every statement of `sync_engine` against the current request"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        _record(statement, elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            elapsed = time.perf_counter() - conn.info["query_started"].pop()
+            _record(exception_context.statement, elapsed)
+
+
+def _record(statement: Optional[str], elapsed: float) -> None:
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {statement}")
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_seconds += elapsed
+    if elapsed > stats.slowest_seconds:
+        stats.slowest_seconds = elapsed
+        stats.slowest_statement = statement
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """
+    For tests: fail when the enclosed code runs more than `max_queries`
+    statements.
+
+        async with AsyncClient(...) as client:
+            with query_budget(3):
+                await client.get("/posts/1/grid")
+
+    Works with in-process ASGI clients, where the request inherits this
+    context; the request's own stats are collected into the same object.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    if stats.queries > max_queries:
+        raise QueryBudgetExceeded(
+            f"{stats.queries} queries over a budget of {max_queries}; "
+            f"slowest: {stats.slowest_statement}"
+        )
+
+
+def _server_timing(stats: QueryStats, total_seconds: float) -> str:
+    return ", ".join((
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"',
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}",
+        f"db-pool;dur={stats.pool_wait_seconds * 1000:.1f}",
+        f"app;dur={total_seconds * 1000:.1f}",
+    ))
+
+
+def _aggregate(method: str, route: str, stats: QueryStats, total_seconds: float) -> None:
+    totals = _routes.get((method, route))
+    if totals is None:
+        totals = _routes[(method, route)] = {
+            "requests": 0,
+            "request_seconds": 0.0,
+            "queries": 0,
+            "db_seconds": 0.0,
+            "pool_wait_seconds": 0.0,
+            "max_queries": 0,
+            "max_query_seconds": 0.0,
+        }
+    totals["requests"] += 1
+    totals["request_seconds"] += total_seconds
+    totals["queries"] += stats.queries
+    totals["db_seconds"] += stats.db_seconds
+    totals["pool_wait_seconds"] += stats.pool_wait_seconds
+    totals["max_queries"] = max(totals["max_queries"], stats.queries)
+    totals["max_query_seconds"] = max(totals["max_query_seconds"], stats.slowest_seconds)
+
+
+def route_metrics() -> Dict[Tuple[str, str], dict]:
+    """Per (method, route) totals collected by QueryStatsMiddleware in this process"""
+    return _routes
+
+
+# App-level routes FastAPI serves without a route template in the scope
+_UNROUTED_PATHS = frozenset({"/docs", "/docs/oauth2-redirect", "/openapi.json", "/redoc"})
+
+
+def _route_label(scope: Scope) -> str:
+    """
+    Route template of the request, or the path for the fixed set of
+    app-level routes. Everything else (404s, CORS preflights answered by
+    the middleware...) shares one label, so request paths can't grow the
+    label set.
+    """
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    if scope["path"] in _UNROUTED_PATHS:
+        return scope["path"]
+    return "unmatched"
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the statements each HTTP request runs, reports them in a
+    Server-Timing header and adds them to the per-route totals.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_prefixes=("/static", "/metrics")):
+        self.app = app
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the stats of an enclosing query_budget block, if any
+        stats = _current.get() or QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _server_timing(stats, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            _aggregate(scope["method"], _route_label(scope), stats, time.perf_counter() - started)
@@ -0,0 +1,28 @@
+"""
+Delete expired stories and their media once, outside the API process:
+
+    python -m app.utils.reap_stories [--batch-size N]
+"""
+import argparse
+import asyncio
+
+from app.database import async_session_maker
+from app.services.media_gc import sweep_media_tombstones
+from app.services.story import reap_expired_stories
+
+
+async def main(batch_size: int = None):
+    async with async_session_maker() as session:
+        metrics = await reap_expired_stories(session, batch_size)
+        swept = await sweep_media_tombstones(session)
+    print(
+        f"Deleted {metrics['stories_deleted']} stories and tombstoned {metrics['files_discarded']} files "
+        f"in {metrics['batches']} batches ({metrics['seconds']}s); swept {swept} tombstones"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete expired stories and their media files")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
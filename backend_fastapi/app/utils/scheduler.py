@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+_tasks: Dict[str, asyncio.Task] = {}
+_job_lock = None
+
+
+async def _run_periodic(name: str, interval_seconds: float, job: Callable[[AsyncSession], Awaitable]):
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await job(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Periodic job '{name}' failed")
+        await asyncio.sleep(interval_seconds)
+
+
+def start_periodic_job(name: str, interval_seconds: float, job: Callable[[AsyncSession], Awaitable]) -> None:
+    """
+    Run `job(session)` every `interval_seconds` in the background of the
+    running event loop. Each run gets its own session.
+    """
+    if name in _tasks and not _tasks[name].done():
+        return
+    _tasks[name] = asyncio.create_task(_run_periodic(name, interval_seconds, job), name=name)
+
+
+async def stop_periodic_jobs() -> None:
+    for task in _tasks.values():
+        task.cancel()
+    await asyncio.gather(*_tasks.values(), return_exceptions=True)
+    _tasks.clear()
+
+
+def claim_job_runner(lock_path: str) -> bool:
+    """
+    With several workers on one host, only the worker holding an exclusive
+    lock on `lock_path` should start the periodic jobs. The lock is released
+    when that process exits.
+    """
+    global _job_lock
+    if _job_lock is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on this platform: every worker runs the jobs
+        return True
+    handle = open(lock_path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _job_lock = handle
+    return True
@@ -0,0 +1,96 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# name -> SingleFlight, for metrics
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller starts the
+    work, later callers await the same task instead of repeating it.
+
+    The work runs on the first caller's resources (its database session), so
+    it is cancelled along with that caller; callers left waiting on it then
+    run fn themselves.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.executions = 0
+        if name:
+            _registry[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.requests += 1
+        task = self._calls.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._discard(key, done))
+            return await task
+        try:
+            # A waiter going away must not cancel the work the others wait on
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+        self.executions += 1
+        return await fn()
+
+    def forget(self, key: Hashable) -> None:
+        """Let the next caller start fresh instead of joining the running call"""
+        self._calls.pop(key, None)
+
+    def _discard(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+
+def coalesce(fn: Callable[..., Awaitable[Any]]):
+    """
+    Decorator for read-only async service functions: concurrent calls with
+    the same arguments share one execution. The shared call runs on the first
+    caller's session, so it costs no extra connection and reads from the
+    engine that caller was routed to; sessions only enter the key through
+    that engine, so replica and primary readers never share a result. Only
+    use it on functions returning plain data or schemas, never ORM objects.
+    """
+    signature = inspect.signature(fn)
+    flight = SingleFlight(f"{fn.__module__}.{fn.__qualname__}")
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(
+            (name, value.bind if isinstance(value, AsyncSession) else value)
+            for name, value in bound.arguments.items()
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return await fn(*args, **kwargs)
+
+        return await flight.do(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
+
+
+def coalescing_metrics() -> Dict[str, dict]:
+    """Per call site: requests seen, executions run and executions saved"""
+    return {
+        name: {
+            "requests": flight.requests,
+            "executions": flight.executions,
+            "saved": flight.requests - flight.executions,
+            "in_flight": len(flight._calls),
+        }
+        for name, flight in _registry.items()
+    }
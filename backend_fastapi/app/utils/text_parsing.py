@@ -0,0 +1,41 @@
+import re
+from typing import List, Optional
+
+# Hashtags: letters, digits and underscores after '#', not preceded by a word char
+HASHTAG_RE = re.compile(r"(?<![\w#])#(\w{1,100})", re.UNICODE)
+# Mentions: same charset as usernames, not part of an e-mail address
+MENTION_RE = re.compile(r"(?<![\w@.])@([A-Za-z0-9_.]{3,50})")
+
+MAX_TAGS_PER_CAPTION = 30
+
+
+def _unique(values: List[str]) -> List[str]:
+    seen = set()
+    result = []
+    for value in values:
+        if value not in seen:
+            seen.add(value)
+            result.append(value)
+    return result[:MAX_TAGS_PER_CAPTION]
+
+
+def normalize_hashtag(tag: str) -> str:
+    return tag.lstrip("#").strip().lower()
+
+
+def extract_hashtags(text: Optional[str]) -> List[str]:
+    """
+    Return the distinct, lower-cased hashtags in a caption (without '#')
+    """
+    if not text:
+        return []
+    return _unique([normalize_hashtag(tag) for tag in HASHTAG_RE.findall(text)])
+
+
+def extract_mentions(text: Optional[str]) -> List[str]:
+    """
+    Return the distinct usernames mentioned in a caption (without '@')
+    """
+    if not text:
+        return []
+    return _unique([name.rstrip(".") for name in MENTION_RE.findall(text)])
@@ -0,0 +1,112 @@
+"""
+Round trips per comment on the write path (create_comment and replies),
+against the database in DATABASE_URL (Postgres):
+
+    python -m benchmarks.comment_round_trips [--comments N]
+
+Each comment runs in its own session, as a request would. Statements are
+counted by the query_stats listeners; BEGIN and COMMIT are counted from
+the engine's transaction events. The rows it creates are removed afterwards.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, event, or_
+
+from app.database import async_session_maker, engine
+import app.main  # noqa: F401  (registers every model)
+from app.models.comment import Comment
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.user import User
+from app.services.comment import create_comment
+from app.utils.query_stats import QueryStats, _current
+
+transactions = {"begin": 0, "commit": 0}
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _on_begin(conn):
+    transactions["begin"] += 1
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _on_commit(conn):
+    transactions["commit"] += 1
+
+
+async def _setup():
+    tag = uuid.uuid4().hex[:8]
+    async with async_session_maker() as db:
+        author = User(username=f"bench_author_{tag}", email=f"author_{tag}@bench.local", hashed_password="x")
+        commenter = User(username=f"bench_commenter_{tag}", email=f"commenter_{tag}@bench.local", hashed_password="x")
+        db.add_all([author, commenter])
+        await db.flush()
+        post = Post(owner_id=author.id, caption="round trip benchmark", image_url="/static/uploads/bench.jpg")
+        db.add(post)
+        await db.commit()
+        return author.id, commenter.id, post.id
+
+
+async def _cleanup(user_ids, post_id):
+    async with async_session_maker() as db:
+        await db.execute(delete(Notification).where(
+            or_(Notification.user_id.in_(user_ids), Notification.sender_id.in_(user_ids))
+        ))
+        await db.execute(delete(Comment).where(Comment.post_id == post_id))
+        await db.execute(delete(Post).where(Post.id == post_id))
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+
+async def _measure(label, comments, write):
+    statements, round_trips, latencies = [], [], []
+    for n in range(comments):
+        stats = QueryStats()
+        token = _current.set(stats)
+        before = dict(transactions)
+        started = time.perf_counter()
+        try:
+            async with async_session_maker() as db:
+                await write(n, db)
+        finally:
+            _current.reset(token)
+        latencies.append((time.perf_counter() - started) * 1000)
+        tx = sum(transactions[key] - before[key] for key in transactions)
+        statements.append(stats.queries)
+        round_trips.append(stats.queries + tx)
+    print(
+        f"{label:<10} statements/comment={statistics.mean(statements):.1f} "
+        f"round_trips/comment={statistics.mean(round_trips):.1f} "
+        f"p50={statistics.median(latencies):.2f}ms "
+        f"p95={sorted(latencies)[int(len(latencies) * 0.95) - 1]:.2f}ms"
+    )
+
+
+async def main(comments: int):
+    author_id, commenter_id, post_id = await _setup()
+    try:
+        parent = {}
+
+        async def top_level(n, db):
+            created = await create_comment(post_id, commenter_id, f"comment {n}", None, db)
+            parent.setdefault("id", created.id)
+
+        async def reply(n, db):
+            await create_comment(post_id, author_id, f"reply {n}", parent["id"], db)
+
+        await _measure("comment", comments, top_level)
+        await _measure("reply", comments, reply)
+    finally:
+        await _cleanup([author_id, commenter_id], post_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round trips per comment on the write path")
+    parser.add_argument("--comments", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.comments))
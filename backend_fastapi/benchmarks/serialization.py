@@ -0,0 +1,166 @@
+"""
+Serialization microbenchmark for the list endpoints, no database needed:
+
+    python -m benchmarks.serialization [--items 50] [--repeat 200]
+
+For each endpoint it renders one page of fake rows two ways:
+
+  baseline  ORM-like objects -> response model instances -> jsonable_encoder
+            -> stdlib json, the path every route took before
+  current   what the route does now: projected dicts (or models) validated
+            once by the route's TypeAdapter and dumped by pydantic-core; plain
+            payloads go through app.utils.fast_json
+
+and prints the time per page and the speedup.
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.schemas.comment import CommentOut
+from app.schemas.notification import NotificationOut
+from app.schemas.post import PostListItem, PostOut
+from app.schemas.reel import ReelOut
+from app.utils import fast_json
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _user(n: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=n, username=f"user{n}", email=f"user{n}@example.com", full_name=f"User {n}",
+        profile_picture=f"/static/uploads/avatars/{n}.jpg", bio="Hello there", is_active=True,
+        is_admin=False, created_at=NOW, followers_count=None, following_count=None,
+        is_followed_by_current_user=None,
+    )
+
+
+def _post(n: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=n, caption=f"Caption number {n} #sunset", is_private=False,
+        image_url=f"/static/uploads/images/{n}.jpg", video_url=None, owner_id=n % 7,
+        created_at=NOW - timedelta(minutes=n), like_count=n * 3, comment_count=n,
+        owner=_user(n % 7), is_liked_by_current_user=bool(n % 2),
+    )
+
+
+def _post_row(n: int) -> dict:
+    post = _post(n)
+    return {
+        **{key: getattr(post, key) for key in (
+            "id", "caption", "is_private", "image_url", "video_url", "owner_id",
+            "created_at", "like_count", "comment_count", "is_liked_by_current_user",
+        )},
+        "owner": {
+            "id": post.owner.id, "username": post.owner.username,
+            "full_name": post.owner.full_name, "profile_picture": post.owner.profile_picture,
+        },
+    }
+
+
+def _reel(n: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=n, caption=f"Reel {n}", video_url=f"/static/uploads/reels/{n}.mp4", owner_id=n % 7,
+        created_at=NOW - timedelta(minutes=n), owner=_user(n % 7), like_count=n, comment_count=n // 2,
+        is_liked_by_current_user=None,
+    )
+
+
+def _comment(n: int, replies: int = 3) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=n, content=f"Comment {n}", user_id=n % 5, post_id=1, reel_id=None, parent_id=None,
+        created_at=NOW - timedelta(seconds=n), reply_count=replies, user=_user(n % 5),
+        replies=[
+            SimpleNamespace(
+                id=n * 100 + r, content=f"Reply {r}", user_id=r, post_id=1, reel_id=None, parent_id=n,
+                created_at=NOW, reply_count=0, user=_user(r),
+            )
+            for r in range(replies)
+        ],
+    )
+
+
+def _notification(n: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=n, notification_type="like", is_read=False, user_id=1, sender_id=n % 9, post_id=n,
+        reel_id=None, comment_id=None, created_at=NOW, sender=_user(n % 9), post=_post(n),
+        reel=None, comment=None,
+    )
+
+
+def _notification_row(n: int) -> dict:
+    notification = _notification(n)
+    post = _post_row(n)
+    user_keys = ("id", "username", "email", "profile_picture", "full_name", "bio", "is_active", "is_admin", "created_at")
+    return {
+        **{key: getattr(notification, key) for key in (
+            "id", "notification_type", "is_read", "user_id", "sender_id", "post_id",
+            "reel_id", "comment_id", "created_at",
+        )},
+        "sender": {key: getattr(notification.sender, key) for key in user_keys},
+        "post": {**post, "owner": {key: getattr(notification.post.owner, key) for key in user_keys}},
+        "reel": None,
+        "comment": None,
+    }
+
+
+def _baseline(model) -> Callable[[list], bytes]:
+    def render(objects):
+        models = [model.model_validate(obj, from_attributes=True) for obj in objects]
+        return json.dumps(jsonable_encoder(models)).encode()
+    return render
+
+
+def _typed(model) -> Callable[[list], bytes]:
+    adapter = TypeAdapter(List[model])
+
+    def render(objects):
+        return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+    return render
+
+
+def _plain(objects) -> bytes:
+    return fast_json.dumps(objects)
+
+
+def _stdlib(objects) -> bytes:
+    return json.dumps(objects, default=str).encode()
+
+
+def main(items: int, repeat: int) -> None:
+    posts = [_post(n) for n in range(items)]
+    post_rows = [_post_row(n) for n in range(items)]
+    reels = [_reel(n) for n in range(items)]
+    comments = [_comment(n) for n in range(items)]
+    notifications = [_notification(n) for n in range(items)]
+    notification_rows = [_notification_row(n) for n in range(items)]
+    unread = [{"unread_count": n} for n in range(items)]
+
+    cases = [
+        ("posts (projected rows)", _baseline(PostOut), posts, _typed(PostListItem), post_rows),
+        ("reels", _baseline(ReelOut), reels, _typed(ReelOut), reels),
+        ("comments with replies", _baseline(CommentOut), comments, _typed(CommentOut), comments),
+        ("notifications (projected)", _baseline(NotificationOut), notifications, _typed(NotificationOut), notification_rows),
+        ("plain payloads (fast_json)", _stdlib, unread, _plain, unread),
+    ]
+
+    print(f"{items} items per page, best of 5 x {repeat} renders")
+    print(f"{'endpoint':<28} {'baseline':>12} {'current':>12} {'speedup':>8}")
+    for name, before, before_input, after, after_input in cases:
+        old = min(timeit.repeat(lambda: before(before_input), number=repeat, repeat=5)) / repeat
+        new = min(timeit.repeat(lambda: after(after_input), number=repeat, repeat=5)) / repeat
+        print(f"{name:<28} {old * 1e6:>9.0f} us {new * 1e6:>9.0f} us {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialization cost per list page")
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.items, args.repeat)
@@ -0,0 +1,135 @@
+"""
+Requests per second of the multi-worker launcher as the worker count grows:
+
+    python -m benchmarks.throughput [--workers 1 2 4] [--path /] [--seconds 10]
+                                    [--connections 64] [--header "Authorization: Bearer ..."]
+
+For each worker count it starts `python -m app.server --workers N` on a
+spare port (the app's startup hooks run, so DATABASE_URL must be reachable),
+drives it with keep-alive HTTP/1.1 connections from several load processes
+and reports throughput and its scaling relative to the first run. Run the
+load generator on a different machine or cpuset than the server for numbers
+that are not capped by the client.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request_bytes(path: str, headers: List[str]) -> bytes:
+    lines = [f"GET {path} HTTP/1.1", "Host: localhost", *headers, "", ""]
+    return "\r\n".join(lines).encode()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _connection(port: int, request: bytes, deadline: float, counts: dict) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.monotonic() < deadline:
+            writer.write(request)
+            status = await _read_response(reader)
+            counts["ok" if status < 400 else "errors"] += 1
+    finally:
+        writer.close()
+
+
+async def _load(port: int, request: bytes, connections: int, seconds: float) -> Tuple[int, int]:
+    counts = {"ok": 0, "errors": 0}
+    deadline = time.monotonic() + seconds
+    await asyncio.gather(*(_connection(port, request, deadline, counts) for _ in range(connections)))
+    return counts["ok"], counts["errors"]
+
+
+def _load_process(args) -> Tuple[int, int]:
+    return asyncio.run(_load(*args))
+
+
+def _wait_ready(port: int, request: bytes, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(request)
+                if sock.recv(64).startswith(b"HTTP/1.1"):
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not come up within {timeout}s")
+
+
+def run(workers: int, args, request: bytes) -> float:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        env={**os.environ, "WEB_WORKERS": str(workers)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(port, request, args.startup_timeout)
+        per_process = max(1, args.connections // args.load_processes)
+        with multiprocessing.Pool(args.load_processes) as pool:
+            started = time.monotonic()
+            results = pool.map(_load_process, [(port, request, per_process, args.seconds)] * args.load_processes)
+            elapsed = time.monotonic() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+    ok = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    rps = ok / elapsed
+    print(f"workers={workers:<3} requests={ok:<8} errors={errors:<5} rps={rps:,.0f}")
+    return rps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of app.server by worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--header", action="append", default=[], help='Extra request header, e.g. "Authorization: Bearer ..."')
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--load-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    request = _request_bytes(args.path, args.header)
+    baseline = None
+    for workers in args.workers:
+        rps = run(workers, args, request)
+        baseline = baseline or rps
+        print(f"           scaling={rps / baseline:.2f}x vs {args.workers[0]} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,4 +14,4 @@ alembic upgrade head
 
 # Запускаем приложение
 echo "Starting server..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec python -m app.server
\ No newline at end of file
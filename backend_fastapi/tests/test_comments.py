@@ -0,0 +1,20 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("path", [
+    "/engagement/posts/1/comments?limit=0",
+    "/engagement/posts/1/comments?limit=10000",
+    "/engagement/posts/1/comments?replies_limit=10000",
+    "/engagement/posts/1/comments?skip=-1",
+    "/engagement/reels/1/comments?limit=10000",
+    "/engagement/reels/1/comments?replies_limit=-1",
+    "/engagement/comments/1/replies?limit=10000",
+    "/engagement/reels/comments/1/replies?limit=10000",
+    "/engagement/comments/1/thread?limit=100000",
+])
+async def test_comment_page_sizes_are_bounded(client, path):
+    response = await client.get(path)
+
+    assert response.status_code == 422
@@ -0,0 +1,11 @@
+from app.config import settings
+from app.database import get_pool_metrics
+
+
+def test_pool_metrics_report_this_workers_share(monkeypatch):
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 24)
+    monkeypatch.setattr(settings, "WEB_WORKERS", 4)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 4)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 20)
+
+    assert get_pool_metrics()["max_overflow"] == 2
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from app.utils.entity_cache import EntityCache
+
+pytestmark = pytest.mark.anyio
+
+
+def slow_loader(value, calls):
+    async def load():
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+    return load
+
+
+async def test_invalidation_only_discards_loads_of_its_key():
+    cache = EntityCache("test-invalidate")
+    calls = []
+
+    first = asyncio.ensure_future(cache.get_or_load("a", slow_loader("a", calls)))
+    second = asyncio.ensure_future(cache.get_or_load("b", slow_loader("b", calls)))
+    await asyncio.sleep(0.005)
+    await cache.invalidate("a")
+    await asyncio.gather(first, second)
+
+    await cache.get_or_load("a", slow_loader("a", calls))
+    await cache.get_or_load("b", slow_loader("b", calls))
+    assert calls == ["a", "b", "a"]
+
+
+async def test_versioned_reads_are_cached_with_several_workers():
+    cache = EntityCache("test-versioned")
+    cache._local_unversioned = False
+    calls = []
+
+    for _ in range(3):
+        await cache.get_or_load("a", slow_loader("a", calls), version=(1,))
+    await cache.get_or_load("a", slow_loader("a", calls), version=(2,))
+
+    assert calls == ["a", "a"]
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models.hashtag import Hashtag, HashtagLink
+from app.models.post import Post
+from app.services.hashtag import index_caption
+
+pytestmark = pytest.mark.anyio
+
+
+async def links(db, post_id):
+    result = await db.execute(
+        select(Hashtag.name, HashtagLink.id, HashtagLink.created_at)
+        .join(HashtagLink, HashtagLink.hashtag_id == Hashtag.id)
+        .where(HashtagLink.post_id == post_id)
+    )
+    return {name: (link_id, created_at) for name, link_id, created_at in result.all()}
+
+
+async def test_editing_a_caption_keeps_unchanged_tag_links(db, user):
+    post = Post(owner_id=user.id, caption="#sunset #beach", image_url="/static/uploads/images/1.jpg")
+    db.add(post)
+    await db.flush()
+    await index_caption(user.id, post.caption, db, post_id=post.id)
+    await db.commit()
+    last_week = datetime.utcnow() - timedelta(days=7)
+    await db.execute(update(HashtagLink).values(created_at=last_week))
+    await db.commit()
+    before = await links(db, post.id)
+
+    await index_caption(user.id, "#beach #surf", db, post_id=post.id)
+    await db.commit()
+
+    after = await links(db, post.id)
+    assert set(after) == {"beach", "surf"}
+    assert after["beach"] == before["beach"]
+    assert after["surf"][1] > last_week
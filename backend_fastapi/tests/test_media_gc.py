@@ -0,0 +1,42 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.models.media import MediaTombstone
+from app.services.media_gc import sweep_media_tombstones
+from app.utils import file_upload
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def media_files():
+    paths = [file_upload.UPLOAD_PATH / f"test-{uuid.uuid4()}.jpg" for _ in range(3)]
+    for path in paths:
+        path.write_bytes(b"x")
+    yield paths
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+async def test_sweep_keeps_tombstones_of_files_it_could_not_delete(db, media_files, monkeypatch):
+    stuck = media_files[0].resolve()
+    remove = file_upload._remove
+
+    def flaky_remove(path):
+        if path == stuck:
+            raise PermissionError("read-only")
+        return remove(path)
+
+    monkeypatch.setattr(file_upload, "_remove", flaky_remove)
+    urls = [file_upload.upload_url(path) for path in media_files]
+    db.add_all([MediaTombstone(media_url=url) for url in urls])
+    await db.commit()
+
+    cleared = await sweep_media_tombstones(db, batch_size=2)
+
+    assert cleared == 2
+    assert (await db.execute(select(MediaTombstone.media_url))).scalars().all() == [urls[0]]
+    assert media_files[0].exists()
+    assert not media_files[1].exists() and not media_files[2].exists()
@@ -0,0 +1,42 @@
+import pytest
+
+from app.models.comment import Comment
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.user import User
+from app.utils.query_stats import query_budget
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def notifications(db, user):
+    bob = User(username="bob", email="bob@example.com", hashed_password="x", is_active=True)
+    post = Post(owner_id=user.id, caption="post", image_url="/static/uploads/images/1.jpg", is_private=False)
+    db.add_all([bob, post])
+    await db.flush()
+    comment = Comment(content="nice", user_id=bob.id, post_id=post.id)
+    db.add(comment)
+    await db.flush()
+    db.add_all([
+        Notification(user_id=user.id, sender_id=bob.id, notification_type="follow"),
+        Notification(user_id=user.id, sender_id=bob.id, notification_type="like", post_id=post.id),
+        Notification(
+            user_id=user.id, sender_id=bob.id, notification_type="comment",
+            post_id=post.id, comment_id=comment.id,
+        ),
+    ])
+    await db.commit()
+
+
+async def test_notifications_run_one_query(client, user, notifications):
+    with query_budget(1):
+        response = await client.get("/notifications/")
+
+    assert response.status_code == 200
+    by_type = {item["notification_type"]: item for item in response.json()}
+    assert by_type["follow"]["sender"]["username"] == "bob"
+    assert by_type["follow"]["post"] is None
+    assert by_type["like"]["post"]["owner"]["username"] == "alice"
+    assert by_type["comment"]["comment"]["content"] == "nice"
+    assert by_type["comment"]["comment"]["user"]["username"] == "bob"
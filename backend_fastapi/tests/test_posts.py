@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.post import Post
+from app.utils.query_stats import query_budget
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def posts(db, user):
+    now = datetime.utcnow()
+    posts = [
+        Post(
+            owner_id=user.id,
+            caption=f"post {n}",
+            image_url=f"/static/uploads/images/{n}.jpg",
+            is_private=False,
+            created_at=now - timedelta(minutes=n),
+        )
+        for n in range(15)
+    ]
+    db.add_all(posts)
+    await db.commit()
+    return posts
+
+
+async def test_profile_grid_runs_one_query(client, user, posts):
+    with query_budget(1):
+        response = await client.get(f"/posts/{user.id}/grid")
+
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page["posts"]) == 12
+    assert page["next_cursor"]
+
+
+async def test_profile_grid_pages_with_cursor(client, user, posts):
+    first = (await client.get(f"/posts/{user.id}/grid?limit=10")).json()
+
+    with query_budget(1):
+        response = await client.get(f"/posts/{user.id}/grid?limit=10&before={first['next_cursor']}")
+
+    second = response.json()
+    ids = [post["id"] for post in first["posts"] + second["posts"]]
+    assert len(ids) == len(set(ids)) == 15
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["nope", "1.2.3", "99999999999999999999999.1", "1.99999999999"])
+async def test_profile_grid_rejects_bad_cursor(client, user, cursor):
+    response = await client.get(f"/posts/{user.id}/grid?before={cursor}")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [0, 1000])
+async def test_profile_grid_bounds_limit(client, user, limit):
+    response = await client.get(f"/posts/{user.id}/grid?limit={limit}")
+
+    assert response.status_code == 422
+
+
+async def test_user_posts_run_one_query(client, user, posts):
+    with query_budget(1):
+        response = await client.get(f"/posts/{user.id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 10
+    assert body[0]["owner"]["username"] == user.username
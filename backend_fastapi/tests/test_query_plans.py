@@ -0,0 +1,166 @@
+"""
+Query-plan regression checks: each hot lookup must be answered from its
+index, never by scanning the table, and ordered pages must come out of the
+index in order, without a sort. The statements are the ones the services
+actually send: each case calls a service function, captures what it
+executes and EXPLAINs the statement picked out by a marker. On Postgres
+sequential scans are turned off for the check, since the planner would
+rightly prefer them on the near-empty test tables.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+from app.models.comment import Comment
+from app.models.post import Post
+from app.models.reel import Reel
+from app.services import graph
+from app.services.comment import get_comment_replies, get_comments_for_post, get_comments_for_reel
+from app.services.follow import get_followers
+from app.services.like import like_post, like_reel
+from app.services.post import get_profile_grid
+
+pytestmark = pytest.mark.anyio
+
+
+async def _following_ids(ids, db):
+    graph._following_cache.delete(ids["user"])
+    await graph.following_ids(ids["user"], db)
+
+
+async def _grid_next_page(ids, db):
+    first = await get_profile_grid(ids["user"], ids["user"], db, limit=1)
+    await get_profile_grid(ids["user"], ids["user"], db, before=first["next_cursor"], limit=1)
+
+
+# (name, service call, marker picking the statement, acceptable indexes).
+# The marker matches the last captured statement containing it.
+# SQLite names the index behind a UNIQUE constraint itself.
+HOT_QUERIES = [
+    (
+        "followed accounts",
+        _following_ids,
+        "FROM follows",
+        {"uq_follows_follower_following", "sqlite_autoindex_follows_1"},
+    ),
+    (
+        "followers of a user",
+        lambda ids, db: get_followers(ids["user"], db=db),
+        "JOIN follows",
+        {"ix_follows_following_follower"},
+    ),
+    (
+        "post like exists",
+        lambda ids, db: like_post(ids["post"], ids["user"], db),
+        "likes.user_id =",
+        {"uq_likes_post_user"},
+    ),
+    (
+        "reel like exists",
+        lambda ids, db: like_reel(ids["reel"], ids["user"], db),
+        "likes.user_id =",
+        {"uq_likes_reel_user"},
+    ),
+    (
+        "top-level comments of a post",
+        lambda ids, db: get_comments_for_post(ids["post"], db=db, replies_limit=0),
+        "FROM comments",
+        {"ix_comments_post_parent_created"},
+    ),
+    (
+        "next page of post comments",
+        lambda ids, db: get_comments_for_post(ids["post"], db=db, before_id=ids["comment"], replies_limit=0),
+        "FROM comments",
+        {"ix_comments_post_parent_created"},
+    ),
+    (
+        "top-level comments of a reel",
+        lambda ids, db: get_comments_for_reel(ids["reel"], db=db, before_id=ids["reel_comment"], replies_limit=0),
+        "FROM comments",
+        {"ix_comments_reel_parent_created"},
+    ),
+    (
+        "replies to a comment",
+        lambda ids, db: get_comment_replies(ids["comment"], db=db),
+        "comments.parent_id =",
+        {"ix_comments_parent_created"},
+    ),
+    (
+        "next page of replies",
+        lambda ids, db: get_comment_replies(ids["comment"], db=db, after_id=ids["reply"]),
+        "comments.parent_id =",
+        {"ix_comments_parent_created"},
+    ),
+    (
+        "profile grid page",
+        lambda ids, db: get_profile_grid(ids["user"], ids["user"], db),
+        "FROM posts",
+        {"ix_posts_owner_created"},
+    ),
+    (
+        "next profile grid page",
+        _grid_next_page,
+        "FROM posts",
+        {"ix_posts_owner_created"},
+    ),
+]
+
+
+@pytest.fixture
+async def ids(db, user):
+    post = Post(owner_id=user.id, caption="post", image_url="/static/uploads/images/1.jpg", is_private=False)
+    reel = Reel(owner_id=user.id, video_url="/static/uploads/reels/1.mp4")
+    db.add_all([post, reel])
+    await db.flush()
+    comment = Comment(content="comment", user_id=user.id, post_id=post.id)
+    reel_comment = Comment(content="comment", user_id=user.id, reel_id=reel.id)
+    db.add_all([comment, reel_comment])
+    await db.flush()
+    reply = Comment(content="reply", user_id=user.id, post_id=post.id, parent_id=comment.id)
+    db.add(reply)
+    await db.commit()
+    return {
+        "user": user.id, "post": post.id, "reel": reel.id,
+        "comment": comment.id, "reel_comment": reel_comment.id, "reply": reply.id,
+    }
+
+
+@contextmanager
+def captured_statements():
+    """(statement, parameters) of every query run inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def explain(db, statement, parameters) -> str:
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = (await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).scalars().all()
+    else:
+        rows = [row[-1] for row in (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()]
+    await db.rollback()
+    return "\n".join(rows)
+
+
+@pytest.mark.parametrize("name, call, marker, indexes", HOT_QUERIES, ids=[case[0] for case in HOT_QUERIES])
+async def test_hot_query_uses_index(db, ids, name, call, marker, indexes):
+    with captured_statements() as statements:
+        await call(ids, db)
+    statement, parameters = [entry for entry in statements if marker in entry[0]][-1]
+
+    plan = await explain(db, statement, parameters)
+
+    assert "Seq Scan" not in plan and "SCAN " not in plan.replace("USING", ""), plan
+    assert any(index in plan for index in indexes), plan
+    assert "Sort" not in plan and "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.user import User
+from app.utils.query_stats import QueryBudgetExceeded, query_budget, route_metrics
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_query_budget_counts_statements(db):
+    with query_budget(2) as stats:
+        await db.execute(select(User.id))
+        await db.execute(select(User.id))
+
+    assert stats.queries == 2
+    assert stats.db_seconds > 0
+
+
+async def test_query_budget_fails_when_exceeded(db):
+    with pytest.raises(QueryBudgetExceeded, match="2 queries over a budget of 1"):
+        with query_budget(1):
+            await db.execute(select(User.id))
+            await db.execute(select(User.id))
+
+
+async def test_request_reports_server_timing(client, user):
+    response = await client.get(f"/posts/{user.id}/grid")
+
+    assert response.status_code == 200
+    assert 'db;dur=' in response.headers["server-timing"]
+    assert '"1 queries"' in response.headers["server-timing"]
+    assert route_metrics()[("GET", "/posts/{user_id}/grid")]["requests"] >= 1
+
+
+async def test_unmatched_paths_share_one_label(client):
+    await client.get("/no/such/path/1")
+    await client.get("/no/such/path/2")
+    await client.get("/openapi.json")
+    # CORS preflights are answered by the middleware, without a route
+    for post_id in range(3):
+        await client.request("OPTIONS", f"/posts/post/{post_id}", {
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+        })
+
+    labels = {route for _, route in route_metrics()}
+    assert "unmatched" in labels
+    assert "/openapi.json" in labels
+    assert not any(label.startswith(("/no/such", "/posts/post/")) for label in labels)
+
+
+async def test_metrics_disabled_without_token(client):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 404
+
+
+async def test_metrics_require_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", {"Authorization": "Bearer wrong"})).status_code == 401
+
+    response = await client.get("/metrics", {"Authorization": "Bearer scrape-me"})
+    assert response.status_code == 200
+    assert "# TYPE http_requests_total counter" in response.body.decode()
@@ -0,0 +1,33 @@
+import pytest
+
+from app.models.reel import Reel
+from app.services import reel_feed
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def reels(db, user):
+    reels = [Reel(owner_id=user.id, video_url=f"/static/uploads/reels/{n}.mp4") for n in range(9)]
+    db.add_all(reels)
+    await db.commit()
+    return [reel.id for reel in reels]
+
+
+async def test_feed_restarts_at_the_head_when_the_queue_is_gone(db, user, reels, monkeypatch):
+    unseen = list(reels)
+
+    async def rank_reels(user_id, db):
+        return list(unseen)
+
+    monkeypatch.setattr(reel_feed, "rank_reels", rank_reels)
+    first = await reel_feed.get_reel_feed(user.id, 0, 3, db)
+    # The first page was watched, then the cached queue expired
+    del unseen[:3]
+    reel_feed._feed_cache.delete(user.id)
+
+    second = await reel_feed.get_reel_feed(user.id, 3, 3, db)
+    third = await reel_feed.get_reel_feed(user.id, 6, 3, db)
+
+    ids = [reel.id for reel in first + second + third]
+    assert ids == reels
@@ -0,0 +1,43 @@
+import pytest
+
+from app.models.like import Like
+from app.models.reel import Reel
+from app.models.user import User
+from app.services import trending
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def reels(db, user, monkeypatch):
+    # Rank again from this test's rows
+    monkeypatch.setattr(trending, "_computed_at", None)
+    bob = User(username="bob", email="bob@example.com", hashed_password="x", is_active=True)
+    db.add(bob)
+    await db.flush()
+    liked = Reel(owner_id=bob.id, video_url="/static/uploads/reels/1.mp4")
+    other = Reel(owner_id=bob.id, video_url="/static/uploads/reels/2.mp4")
+    db.add_all([liked, other])
+    await db.flush()
+    db.add(Like(reel_id=liked.id, user_id=user.id))
+    await db.commit()
+    return liked.id, other.id
+
+
+async def test_trending_reels_show_the_viewers_likes(client, reels):
+    liked_id, _ = reels
+
+    response = await client.get("/search/trending/reels")
+
+    assert response.status_code == 200
+    liked = {reel["id"]: reel["is_liked_by_current_user"] for reel in response.json()}
+    assert liked == {liked_id: True}
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+async def test_trending_reels_are_shared_for_anonymous_viewers(anonymous_client, reels):
+    response = await anonymous_client.get("/search/trending/reels")
+
+    assert response.status_code == 200
+    assert [reel["is_liked_by_current_user"] for reel in response.json()] == [None]
+    assert response.headers["cache-control"].startswith("public")
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight, coalesce
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_the_first_callers_session(db):
+    sessions = []
+
+    @coalesce
+    async def load(item_id, db):
+        sessions.append(db)
+        await asyncio.sleep(0.01)
+        return item_id * 2
+
+    results = await asyncio.gather(*(load(21, db) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert sessions == [db]
+
+
+async def test_waiters_rerun_when_the_first_caller_is_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("key", work))
+    await started.wait()
+    waiter = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "done"
+    assert leader.cancelled()
+    assert len(calls) == 2